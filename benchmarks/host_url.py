@@ -0,0 +1,63 @@
+"""
+Compares the time to render URLs with the host_url template tag and the
+Jinja2 host_url function, run from the repository root with::
+
+    python -m benchmarks.host_url
+"""
+
+import os
+import timeit
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+django.setup()
+
+import jinja2  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.template import Context, Template  # noqa: E402
+
+from django_hosts.jinja2 import HostsExtension  # noqa: E402
+
+settings.ROOT_HOSTCONF = "tests.hosts.simple"
+settings.DEFAULT_HOST = "www"
+
+NUMBER = 100
+ITEMS = list(range(100))
+
+CASES = [
+    (
+        "literal host",
+        "{% for item in items %}{% host_url 'simple-direct' host 'static' %}{% endfor %}",
+        "{% for item in items %}{{ host_url('simple-direct', host='static') }}{% endfor %}",
+    ),
+    (
+        "host arguments",
+        "{% for item in items %}{% host_url 'simple-direct' host 'with_args' item %}{% endfor %}",
+        "{% for item in items %}{{ host_url('simple-direct', host='with_args', host_args=[item]) }}{% endfor %}",
+    ),
+    (
+        "scheme and port",
+        "{% for item in items %}{% host_url 'simple-direct' host 'www' scheme 'https' port '8000' %}{% endfor %}",
+        "{% for item in items %}{{ host_url('simple-direct', host='www', scheme='https', port='8000') }}"
+        "{% endfor %}",
+    ),
+]
+
+
+def main():
+    environment = jinja2.Environment(extensions=[HostsExtension])
+    for name, django_source, jinja2_source in CASES:
+        django_template = Template("{% load hosts %}" + django_source)
+        jinja2_template = environment.from_string(jinja2_source)
+        assert django_template.render(Context({"items": ITEMS})) == jinja2_template.render(items=ITEMS)
+        django_time = timeit.timeit(lambda: django_template.render(Context({"items": ITEMS})), number=NUMBER)
+        jinja2_time = timeit.timeit(lambda: jinja2_template.render(items=ITEMS), number=NUMBER)
+        print(
+            "%-16s django: %6.2f ms  jinja2: %6.2f ms  (per %d URLs)"
+            % (name, django_time * 1000 / NUMBER, jinja2_time * 1000 / NUMBER, len(ITEMS))
+        )
+
+
+if __name__ == "__main__":
+    main()
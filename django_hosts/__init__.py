@@ -6,6 +6,7 @@ try:  # pragma: no cover
     from django_hosts.resolvers import (
         reverse,
         reverse_lazy,
+        reverse_many,
         reverse_host,
         reverse_host_lazy,
     )
@@ -1,8 +1,9 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 from django.core import checks
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import gettext_lazy as _
 
-from .checks import check_default_host, check_root_hostconf
+from .checks import check_default_host, check_root_hostconf, check_site_domains
 
 
 class HostsConfig(AppConfig):  # pragma: no cover
@@ -12,3 +13,11 @@ class HostsConfig(AppConfig):  # pragma: no cover
     def ready(self):
         checks.register(check_root_hostconf)
         checks.register(check_default_host)
+        checks.register(check_site_domains, checks.Tags.database)
+        if apps.is_installed("django.contrib.sites"):
+            from django.contrib.sites.models import Site
+
+            from .callbacks import site_changed_receiver
+
+            post_save.connect(site_changed_receiver, sender=Site)
+            post_delete.connect(site_changed_receiver, sender=Site)
@@ -1,10 +1,44 @@
+import asyncio
+import random
+import time
+from functools import lru_cache
+
 from django.conf import settings
+from django.db import router
+from django.db.models.signals import post_delete
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.utils.functional import LazyObject
+from django.utils.functional import LazyObject, empty
 
 from .resolvers import reverse_host
+from .utils import KeyLock, LRUCache, normalize_domain
 
 HOST_SITE_TIMEOUT = getattr(settings, "HOST_SITE_TIMEOUT", 3600)
+HOST_SITE_REVERSE_HOST = getattr(settings, "HOST_SITE_REVERSE_HOST", False)
+HOST_SITE_LOOKUP = getattr(settings, "HOST_SITE_LOOKUP", "iexact")
+HOST_SITE_TIMEOUT_JITTER = getattr(settings, "HOST_SITE_TIMEOUT_JITTER", 0)
+HOST_SITE_STALE_TIMEOUT = getattr(settings, "HOST_SITE_STALE_TIMEOUT", 0)
+HOST_SITE_LOCK_TIMEOUT = getattr(settings, "HOST_SITE_LOCK_TIMEOUT", 0)
+HOST_SITE_LOCAL_TIMEOUT = getattr(settings, "HOST_SITE_LOCAL_TIMEOUT", 60)
+HOST_SITE_LOCAL_CACHE_SIZE = getattr(settings, "HOST_SITE_LOCAL_CACHE_SIZE", 5000)
+
+#: The cache key of the version of the sites in the cache, changed
+#: whenever a site is saved or deleted.
+SITE_VERSION_KEY = "hosts:version"
+
+#: The version of the format of the sites in the cache, see pack_site().
+SITE_PAYLOAD_VERSION = "site:1"
+
+#: The sites found by :class:`LocalCachedLazySite` in this process, as
+#: ``(site, version, expiry time)`` tuples by host name.
+local_sites = LRUCache(HOST_SITE_LOCAL_CACHE_SIZE)
+
+#: The sites by case-folded domain loaded by :func:`preload_sites`, if any.
+preloaded_sites = None
+
+#: The locks making sure only one thread of this process gets a site from
+#: the database at a time, by cache key.
+site_locks = KeyLock()
 
 
 class LazySite(LazyObject):
@@ -16,33 +50,255 @@ class LazySite(LazyObject):
                 "name": request.host.name,
                 "args": args,
                 "kwargs": kwargs,
+                "host_domain": getattr(request, "host_domain", None),
             }
         )
 
     def _setup(self):
-        host = reverse_host(self.name, args=self.args, kwargs=self.kwargs)
+        self._wrapped = self.get_site(self.get_host_domain())
+
+    async def asetup(self):
+        """
+        Returns the site, getting it without blocking if needed.
+        """
+        if self._wrapped is empty:
+            self._wrapped = await self.aget_site(self.get_host_domain())
+        return self._wrapped
+
+    def get_host_domain(self):
+        host = self.host_domain
+        if host is None or HOST_SITE_REVERSE_HOST:
+            host = reverse_host(self.name, args=self.args, kwargs=self.kwargs)
+        if HOST_SITE_LOOKUP == "exact":
+            host = normalize_domain(host)
+        return host
+
+    def get_site(self, host):
+        from django.contrib.sites.models import Site
+
+        return get_object_or_404(Site, **{"domain__%s" % HOST_SITE_LOOKUP: host})
+
+    async def aget_site(self, host):
         from django.contrib.sites.models import Site
 
-        site = get_object_or_404(Site, domain__iexact=host)
-        self._wrapped = site
+        try:
+            return await Site.objects.aget(**{"domain__%s" % HOST_SITE_LOOKUP: host})
+        except Site.DoesNotExist:
+            raise Http404("No Site matches the given query.")
 
 
 class CachedLazySite(LazySite):
 
-    def _setup(self):
-        host = reverse_host(self.name, args=self.args, kwargs=self.kwargs)
+    def get_site(self, host, version=None):
         cache_key = "hosts:%s" % host
         from django.core.cache import cache
 
-        site = cache.get(cache_key, None)
+        site, refresh_at = unpack_site(cache.get(cache_key, None, version=version))
         if site is not None:
-            self._wrapped = site
-            return
-        from django.contrib.sites.models import Site
+            if refresh_at is None or refresh_at > time.time():
+                return site
+            # The site is stale: refresh it, unless another thread or
+            # process already does, and use the stale one meanwhile.
+            with site_locks(cache_key, blocking=False) as acquired:
+                if acquired and acquire_cache_lock(cache, cache_key, version):
+                    try:
+                        return self.cache_site(cache, cache_key, host, version)
+                    finally:
+                        release_cache_lock(cache, cache_key, version)
+            return site
+
+        with site_locks(cache_key):
+            # Another thread may have cached the site while waiting.
+            site, refresh_at = unpack_site(cache.get(cache_key, None, version=version))
+            if site is not None:
+                return site
+            if not acquire_cache_lock(cache, cache_key, version):
+                # Another process gets the site, wait for it to be cached.
+                deadline = time.monotonic() + HOST_SITE_LOCK_TIMEOUT
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    site, refresh_at = unpack_site(cache.get(cache_key, None, version=version))
+                    if site is not None:
+                        return site
+                return self.cache_site(cache, cache_key, host, version)
+            try:
+                return self.cache_site(cache, cache_key, host, version)
+            finally:
+                release_cache_lock(cache, cache_key, version)
+
+    def cache_site(self, cache, cache_key, host, version):
+        site = super().get_site(host)
+        value, timeout = pack_site(site)
+        cache.set(cache_key, value, timeout, version=version)
+        return site
+
+    async def aget_site(self, host):
+        # Like get_site() without the thread locks, which would block.
+        cache_key = "hosts:%s" % host
+        from django.core.cache import cache
+
+        site, refresh_at = unpack_site(await cache.aget(cache_key, None))
+        if site is not None and (refresh_at is None or refresh_at > time.time()):
+            return site
+        locked = bool(HOST_SITE_LOCK_TIMEOUT)
+        if locked and not await cache.aadd("%s:lock" % cache_key, True, HOST_SITE_LOCK_TIMEOUT):
+            if site is not None:
+                # Another process refreshes the stale site.
+                return site
+            # Another process gets the site, wait for it to be cached.
+            deadline = time.monotonic() + HOST_SITE_LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                site, refresh_at = unpack_site(await cache.aget(cache_key, None))
+                if site is not None:
+                    return site
+            locked = False
+        try:
+            site = await super().aget_site(host)
+            value, timeout = pack_site(site)
+            await cache.aset(cache_key, value, timeout)
+        finally:
+            if locked:
+                await cache.adelete("%s:lock" % cache_key)
+        return site
+
+
+def pack_site(site):
+    """
+    Returns the value to cache for the given site and the time to cache it.
+    The site is cached as a tuple of its field values, which is smaller
+    and faster to load than a pickled model instance.
+    """
+    value = (SITE_PAYLOAD_VERSION, *(getattr(site, field.attname) for field in site._meta.concrete_fields))
+    timeout = HOST_SITE_TIMEOUT
+    if HOST_SITE_TIMEOUT_JITTER and timeout:
+        # Spread the expiry of the sites cached at the same time.
+        timeout = int(timeout * (1 - random.uniform(0, HOST_SITE_TIMEOUT_JITTER)))
+    if HOST_SITE_STALE_TIMEOUT and timeout:
+        return (value, time.time() + timeout), timeout + HOST_SITE_STALE_TIMEOUT
+    return value, timeout
+
+
+def unpack_site(value):
+    """
+    Returns the site and the time to refresh it of the given cached value,
+    cached with or without the time to refresh it. Sites cached as model
+    instances are used too, other values are ignored.
+    """
+    from django.contrib.sites.models import Site
+
+    refresh_at = None
+    if isinstance(value, tuple) and len(value) == 2:
+        value, refresh_at = value
+    if isinstance(value, Site):
+        return value, refresh_at
+    if isinstance(value, tuple) and value and value[0] == SITE_PAYLOAD_VERSION:
+        field_names = get_site_field_names()
+        if len(value) == len(field_names) + 1:
+            return Site.from_db(router.db_for_read(Site), field_names, value[1:]), refresh_at
+    return None, None
+
+
+@lru_cache
+def get_site_field_names():
+    from django.contrib.sites.models import Site
+
+    return [field.attname for field in Site._meta.concrete_fields]
+
+
+def acquire_cache_lock(cache, cache_key, version):
+    if not HOST_SITE_LOCK_TIMEOUT:
+        return True
+    return cache.add("%s:lock" % cache_key, True, HOST_SITE_LOCK_TIMEOUT, version=version)
+
+
+def release_cache_lock(cache, cache_key, version):
+    if HOST_SITE_LOCK_TIMEOUT:
+        cache.delete("%s:lock" % cache_key, version=version)
+
+
+def get_site_version():
+    from django.core.cache import cache
+
+    version = cache.get(SITE_VERSION_KEY)
+    if version is None:
+        # Start from the current time so that sites cached before the
+        # version was evicted from the cache aren't used again.
+        cache.add(SITE_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(SITE_VERSION_KEY)
+    return version
+
+
+class LocalCachedLazySite(CachedLazySite):
+
+    def get_site(self, host):
+        now = time.monotonic()
+        entry = local_sites.get(host)
+        if entry is not None and entry[2] > now:
+            return entry[0]
+        version = get_site_version()
+        if entry is not None and entry[1] == version:
+            # No site was changed since, so keep using it.
+            site = entry[0]
+        else:
+            site = super().get_site(host, version)
+        local_sites.set(host, (site, version, now + HOST_SITE_LOCAL_TIMEOUT))
+        return site
+
+
+def preload_sites():
+    """
+    Loads all sites into memory for the
+    :func:`~django_hosts.callbacks.preloaded_host_site` callback, or loads
+    them again, e.g. in the WSGI file so that the processes forked by the
+    server share them.
+    """
+    global preloaded_sites
+    from django.contrib.sites.models import Site
+
+    sites = {}
+    for site in Site.objects.order_by("pk"):
+        sites.setdefault(site.domain.casefold(), site)
+    preloaded_sites = sites
+    return sites
+
+
+class PreloadedLazySite(LazySite):
 
-        site = get_object_or_404(Site, domain__iexact=host)
-        cache.set(cache_key, site, HOST_SITE_TIMEOUT)
-        self._wrapped = site
+    def get_site(self, host):
+        sites = preloaded_sites
+        if sites is None:
+            sites = preload_sites()
+        try:
+            return sites[host.casefold()]
+        except KeyError:
+            raise Http404("No Site matches the given query.")
+
+
+def site_changed_receiver(sender, instance, signal, **kwargs):
+    """
+    Invalidates the sites cached by
+    :func:`~django_hosts.callbacks.local_cached_host_site` in this and,
+    after :attr:`~django.conf.settings.HOST_SITE_LOCAL_TIMEOUT`, the other
+    processes and updates the sites loaded by :func:`preload_sites` when a
+    site is saved or deleted.
+    """
+    global preloaded_sites
+    from django.core.cache import cache
+
+    local_sites.clear()
+    try:
+        cache.incr(SITE_VERSION_KEY)
+    except ValueError:
+        cache.add(SITE_VERSION_KEY, time.time_ns(), None)
+
+    if preloaded_sites is not None:
+        # Replace the sites instead of changing them, for the threads
+        # looking them up meanwhile.
+        sites = {domain: site for domain, site in preloaded_sites.items() if site.pk != instance.pk}
+        if signal is not post_delete:
+            sites.setdefault(instance.domain.casefold(), instance)
+        preloaded_sites = sites
 
 
 def host_site(request, *args, **kwargs):
@@ -56,12 +312,17 @@ def host_site(request, *args, **kwargs):
     :param \*args: the parameters as matched by the host patterns
     :param \*\*kwargs: the keyed parameters as matched by the host patterns
 
-    It's important to note that this uses
-    :func:`~django_hosts.resolvers.reverse_host` behind the scenes to
-    reverse the host with the given arguments and keyed arguments to
-    enable a flexible configuration of what will be used to retrieve
-    the :class:`~django.contrib.sites.models.Site` instance -- in the end
-    the callback will use a ``domain__iexact`` lookup to get it.
+    It's important to note that this uses the host of the request,
+    lowercased and without port, to retrieve the
+    :class:`~django.contrib.sites.models.Site` instance with a
+    ``domain__iexact`` lookup, see
+    :attr:`~django.conf.settings.HOST_SITE_LOOKUP`. If the host pattern
+    only matched the start of the request's host, or with the
+    :attr:`~django.conf.settings.HOST_SITE_REVERSE_HOST` setting, it uses
+    :func:`~django_hosts.resolvers.reverse_host` behind the scenes instead
+    to reverse the host with the given arguments and keyed arguments,
+    enabling a flexible configuration of what will be used to retrieve
+    the site.
 
     For example, imagine a host conf with a username parameter::
 
@@ -82,8 +343,9 @@ def host_site(request, *args, **kwargs):
 
         request.site = Site.objects.get(domain__iexact='jezdez.example.com')
 
-    ..since the result of calling :func:`~django_hosts.resolvers.reverse_host`
-    with the username ``'jezdez'`` is ``'jezdez.example.com'``.
+    ..which is also the result of calling
+    :func:`~django_hosts.resolvers.reverse_host` with the username
+    ``'jezdez'``.
 
     Later, in your views, you can nicely refer to the current site
     as ``request.site`` for further site-specific functionality.
@@ -98,8 +360,103 @@ def cached_host_site(request, *args, **kwargs):
     instance in the default cache backend for the time specfified as
     :attr:`~django.conf.settings.HOST_SITE_TIMEOUT`.
 
+    When the site isn't cached only one thread of a process gets it from
+    the database, see :attr:`~django.conf.settings.HOST_SITE_STALE_TIMEOUT`,
+    :attr:`~django.conf.settings.HOST_SITE_LOCK_TIMEOUT` and
+    :attr:`~django.conf.settings.HOST_SITE_TIMEOUT_JITTER` to avoid more
+    database queries when popular sites expire.
+
+    :param request: the request object passed from the middleware
+    :param \*args: the parameters as matched by the host patterns
+    :param \*\*kwargs: the keyed parameters as matched by the host patterns
+    """
+    request.site = CachedLazySite(request, *args, **kwargs)
+
+
+async def async_host_site(request, *args, **kwargs):
+    r"""
+    The async version of the :func:`~django_hosts.callbacks.host_site`
+    callback, which also sets a ``request.asite`` coroutine function
+    returning the :class:`~django.contrib.sites.models.Site` instance
+    without blocking, e.g. in async views::
+
+        async def index(request):
+            site = await request.asite()
+            ...
+
+    Once awaited, ``request.site`` can be used in async code too.
+
+    :param request: the request object passed from the middleware
+    :param \*args: the parameters as matched by the host patterns
+    :param \*\*kwargs: the keyed parameters as matched by the host patterns
+    """
+    request.site = LazySite(request, *args, **kwargs)
+    request.asite = request.site.asetup
+
+
+async def async_cached_host_site(request, *args, **kwargs):
+    r"""
+    The async version of the
+    :func:`~django_hosts.callbacks.cached_host_site` callback, see
+    :func:`~django_hosts.callbacks.async_host_site`. ``request.asite()``
+    uses the async API of the cache backend and doesn't make concurrent
+    requests of the same process wait for each other, so only
+    :attr:`~django.conf.settings.HOST_SITE_LOCK_TIMEOUT` protects against
+    concurrent requests getting the same site from the database, waiting
+    for the site to be cached by the request holding the lock.
+
     :param request: the request object passed from the middleware
     :param \*args: the parameters as matched by the host patterns
     :param \*\*kwargs: the keyed parameters as matched by the host patterns
     """
     request.site = CachedLazySite(request, *args, **kwargs)
+    request.asite = request.site.asetup
+
+
+def local_cached_host_site(request, *args, **kwargs):
+    r"""
+    A callback function similar to
+    :func:`~django_hosts.callbacks.cached_host_site` which also keeps the
+    resulting :class:`~django.contrib.sites.models.Site` instances in
+    memory for the time specified as
+    :attr:`~django.conf.settings.HOST_SITE_LOCAL_TIMEOUT`, up to
+    :attr:`~django.conf.settings.HOST_SITE_LOCAL_CACHE_SIZE` of them.
+
+    Saving or deleting a site changes the version of the sites in the
+    cache, so that other processes get the changed site from the database
+    at the latest when the sites they keep in memory expire. The site
+    instances kept in memory are shared between requests and shouldn't
+    be modified.
+
+    :param request: the request object passed from the middleware
+    :param \*args: the parameters as matched by the host patterns
+    :param \*\*kwargs: the keyed parameters as matched by the host patterns
+    """
+    request.site = LocalCachedLazySite(request, *args, **kwargs)
+
+
+def preloaded_host_site(request, *args, **kwargs):
+    r"""
+    A callback function similar to :func:`~django_hosts.callbacks.host_site`
+    which looks up the :class:`~django.contrib.sites.models.Site` instance
+    in all sites loaded into memory by
+    :func:`~django_hosts.callbacks.preload_sites`, without any database
+    query or cache access, e.g. in ``wsgi.py``::
+
+        from django.core.wsgi import get_wsgi_application
+        from django_hosts.callbacks import preload_sites
+
+        application = get_wsgi_application()
+        preload_sites()
+
+    The sites are loaded on the first request if they aren't yet. Saving or
+    deleting a site updates them in the same process only, other processes
+    need to call :func:`~django_hosts.callbacks.preload_sites` again.
+    The site instances are shared between requests and shouldn't be
+    modified.
+
+    :param request: the request object passed from the middleware
+    :param \*args: the parameters as matched by the host patterns
+    :param \*\*kwargs: the keyed parameters as matched by the host patterns
+    """
+    request.site = PreloadedLazySite(request, *args, **kwargs)
@@ -1,5 +1,9 @@
+from django.apps import apps
 from django.conf import settings
 from django.core import checks
+from django.db import DatabaseError
+
+from .utils import normalize_domain
 
 E001 = checks.Error(
     "Missing 'DEFAULT_HOST' setting.",
@@ -20,3 +24,33 @@ def check_default_host(app_configs, **kwargs):  # pragma: no cover
 
 def check_root_hostconf(app_configs, **kwargs):  # pragma: no cover
     return [] if getattr(settings, "ROOT_HOSTCONF", False) else [E002]
+
+
+def check_site_domains(app_configs, databases=None, **kwargs):
+    if getattr(settings, "HOST_SITE_LOOKUP", "iexact") != "exact" or not databases:
+        return []
+    if not apps.is_installed("django.contrib.sites"):
+        return []
+    from django.contrib.sites.models import Site
+
+    warnings = []
+    for alias in databases:
+        try:
+            sites = list(Site.objects.using(alias).order_by("pk"))
+        except DatabaseError:
+            # E.g. the sites haven't been migrated yet.
+            continue
+        for site in sites:
+            domain = normalize_domain(site.domain)
+            if site.domain != domain:
+                warnings.append(
+                    checks.Warning(
+                        "The domain '%s' of the site %s in the '%s' database isn't normalized."
+                        % (site.domain, site.pk, alias),
+                        hint="Change it to '%s', the 'exact' HOST_SITE_LOOKUP setting won't find it otherwise."
+                        % domain,
+                        obj=site,
+                        id="django_hosts.W001",
+                    )
+                )
+    return warnings
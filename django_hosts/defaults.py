@@ -3,16 +3,25 @@ When defining hostconfs you need to use the ``patterns`` and ``host`` helpers
 """
 
 import re
+import weakref
+
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ViewDoesNotExist
+from django.core.signals import setting_changed
 from django.urls import (
+    NoReverseMatch,
     get_callable as actual_get_callable,
     get_mod_func,
 )
-from django.utils.encoding import smart_str
+from django.utils.encoding import iri_to_uri, smart_str
 from django.utils.functional import cached_property
+from django.utils.regex_helper import normalize
+
+from .utils import normalize_scheme, normalize_port, regex_literal
 
-from .utils import normalize_scheme, normalize_port
+#: All host objects, to reset their settings based properties
+#: when the settings change, e.g. in tests.
+host_instances = weakref.WeakSet()
 
 
 def get_callable(lookup_view):
@@ -28,6 +37,13 @@ def get_callable(lookup_view):
         raise ImproperlyConfigured(exc.args[0].replace("View", "Callable"))
 
 
+def null_callback(request, *args, **kwargs):
+    """
+    The callback of hosts that don't define one.
+    """
+    return None
+
+
 def patterns(prefix, *args):
     r"""
     The function to define the list of hosts (aka hostconfs), e.g.::
@@ -45,14 +61,16 @@ def patterns(prefix, *args):
                    or an iterable thereof
     """
     hosts = []
+    names = set()
     for arg in args:
         if isinstance(arg, (list, tuple)):
             arg = host(prefix=prefix, *arg)
         else:
             arg.add_prefix(prefix)
         name = arg.name
-        if name in [h.name for h in hosts]:
+        if name in names:
             raise ImproperlyConfigured("Duplicate host name: %s" % name)
+        names.add(name)
         hosts.append(arg)
     return hosts
 
@@ -99,6 +117,11 @@ class host:
         parent_host = getattr(settings, "PARENT_HOST", "").lstrip(".")
         suffix = r"\." + parent_host if parent_host else ""
         self.compiled_regex = re.compile(rf"{regex}{suffix}(\.|:|$)")
+        # The hostname matched by patterns without any regex syntax,
+        # used by the middleware to look up such hosts in a dict.
+        self.literal = regex_literal(regex)
+        if self.literal is not None and parent_host:
+            self.literal = f"{self.literal}.{parent_host}"
         self.urlconf = urlconf
         self.name = name
         self._scheme = scheme
@@ -108,6 +131,7 @@ class host:
         else:
             self._callback, self._callback_str = None, callback
         self.add_prefix(prefix)
+        host_instances.add(self)
 
     def __repr__(self):
         return smart_str(
@@ -124,22 +148,71 @@ class host:
 
     @cached_property
     def scheme(self):
-        if self._scheme is None:
-            self._scheme = getattr(settings, "HOST_SCHEME", "//")
-        return normalize_scheme(self._scheme)
+        scheme = self._scheme
+        if scheme is None:
+            scheme = getattr(settings, "HOST_SCHEME", "//")
+        return normalize_scheme(scheme)
 
     @cached_property
     def port(self):
-        if self._port is None:
-            self._port = getattr(settings, "HOST_PORT", "")
-        return normalize_port(self._port)
+        port = self._port
+        if port is None:
+            port = getattr(settings, "HOST_PORT", "")
+        return normalize_port(port)
+
+    @cached_property
+    def hostname(self):
+        """
+        The reversed host name if the host doesn't have any parameters,
+        otherwise ``None``.
+        """
+        from .resolvers import reverse_host
+
+        if any(params for result, params in self.reverse_templates):
+            return None
+        try:
+            return reverse_host(self)
+        except NoReverseMatch:
+            return None
+
+    @cached_property
+    def url_prefix(self):
+        """
+        The scheme, host name and port to prepend to paths when reversing
+        URLs of a host without parameters, otherwise ``None``.
+        """
+        if self.hostname is None:
+            return None
+        return iri_to_uri(f"{self.scheme}{self.hostname}{self.port}")
+
+    def reset(self):
+        """
+        Resets the properties computed from the settings.
+        """
+        for name in ["scheme", "port", "hostname", "url_prefix"]:
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def reverse_templates(self):
+        """
+        The ``(template, params)`` pairs used to reverse the host,
+        see :func:`~django_hosts.resolvers.reverse_host`.
+        """
+        return normalize(self.regex)
+
+    @cached_property
+    def reverse_regex(self):
+        """
+        The compiled regex to validate reversed host names with.
+        """
+        return re.compile(self.regex)
 
     @property
     def callback(self):
         if self._callback is not None:
             return self._callback
         elif self._callback_str is None:
-            return lambda *args, **kwargs: None
+            return null_callback
         try:
             self._callback = get_callable(self._callback_str)
         except ImportError as exc:
@@ -158,3 +231,12 @@ class host:
         """
         if prefix:
             self.urlconf = prefix.rstrip(".") + "." + self.urlconf
+
+
+def setting_changed_receiver(setting, enter, **kwargs):
+    if setting in {"PARENT_HOST", "HOST_SCHEME", "HOST_PORT"}:
+        for instance in list(host_instances):
+            instance.reset()
+
+
+setting_changed.connect(setting_changed_receiver)
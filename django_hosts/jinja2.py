@@ -0,0 +1,73 @@
+"""
+Jinja2 support, see :ref:`jinja2`.
+"""
+
+from django.core.signals import setting_changed
+from django.urls import reverse as reverse_path
+from jinja2.ext import Extension
+
+from .resolvers import get_host, make_reverse_key, reverse_url_prefix
+from .utils import LRUCache
+
+#: The URL prefixes of hosts with parameters, schemes or ports, shared by
+#: all environments, threads and async tasks.
+url_prefixes = LRUCache(maxsize=1024)
+
+
+def host_url(
+    viewname,
+    *args,
+    host=None,
+    host_args=None,
+    host_kwargs=None,
+    scheme=None,
+    port=None,
+    current_app=None,
+    **kwargs,
+):
+    """
+    The Jinja2 equivalent of the
+    :func:`~django_hosts.templatetags.hosts.host_url` template tag, e.g.::
+
+        {{ host_url('repo', 'jezdez', host='www', scheme='https') }}
+        {{ host_url('homepage', host='wildcard', host_args=['spam']) }}
+
+    The positional and remaining keyword arguments are passed to the view,
+    the other parameters are the ones of
+    :func:`~django_hosts.resolvers.reverse`. The part of the URL before the
+    path is only computed once for the same host parameters. It doesn't
+    depend on any per-thread state and is safe to use with
+    ``enable_async``.
+    """
+    host = get_host(host)
+    path = reverse_path(viewname, urlconf=host.urlconf, args=args, kwargs=kwargs, current_app=current_app)
+    try:
+        # Like the reverse cache, the key includes the type of each value,
+        # as e.g. 1 and True are equal but reversed differently.
+        key = (host, make_reverse_key((host_args or (), host_kwargs or {}, scheme, port)))
+        url_prefix = url_prefixes.get(key)
+    except TypeError:
+        key = url_prefix = None
+    if url_prefix is None:
+        url_prefix = reverse_url_prefix(host, host_args, host_kwargs, scheme, port)
+        if key is not None:
+            url_prefixes.set(key, url_prefix)
+    return url_prefix + path
+
+
+def setting_changed_receiver(setting, enter, **kwargs):
+    url_prefixes.clear()
+
+
+setting_changed.connect(setting_changed_receiver)
+
+
+class HostsExtension(Extension):
+    """
+    A Jinja2 extension adding the :func:`~django_hosts.jinja2.host_url`
+    function to the globals of the environment.
+    """
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.globals["host_url"] = host_url
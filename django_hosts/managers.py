@@ -1,6 +1,16 @@
+from collections import namedtuple
+
 from django.conf import settings
+from django.core import checks
 from django.db import models
 from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import empty
+
+from . import callbacks
+
+#: The lookup to filter a model by site, and the relations to the site to
+#: select and prefetch.
+SitePath = namedtuple("SitePath", ["filter_key", "select_related", "prefetch_related"])
 
 
 class HostSiteManager(models.Manager):
@@ -14,7 +24,14 @@ class HostSiteManager(models.Manager):
                        to looking for 'site' and 'sites' fields.
     :param select_related: a boolean specifying whether to use
                            :meth:`~django.db.models.QuerySet.select_related`
-                           when querying the database
+                           for the foreign keys and
+                           :meth:`~django.db.models.QuerySet.prefetch_related`
+                           for the other relations to the site when
+                           querying the database
+    :param exists: a boolean specifying whether to match the site with an
+                   ``EXISTS`` subquery instead of joins, e.g. to not
+                   duplicate objects related to the site through
+                   many-to-many relations
 
     Define a manager instance in your model class with one
     of the following notations::
@@ -24,6 +41,10 @@ class HostSiteManager(models.Manager):
         on_site = HostSiteManager("author__blog__site")
         on_site = HostSiteManager("author__blog__site",
                                   select_related=False)
+        on_site = HostSiteManager("authors__site", exists=True)
+
+    The relations to the site are validated by the system checks, see
+    ``django_hosts.E003``.
 
     Then query against it with one of the manager methods::
 
@@ -33,21 +54,39 @@ class HostSiteManager(models.Manager):
 
     """
 
-    def __init__(self, field_name=None, select_related=True):
+    #: The validated relations to the site, by model and field name.
+    _site_paths = {}
+
+    def __init__(self, field_name=None, select_related=True, exists=False):
         super().__init__()
         self._field_name = field_name
         self._select_related = select_related
-        self._depth = 1
-        self._is_validated = False
+        self._exists = exists
+        self._site_path = None
+
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        try:
+            self._get_site_path()
+        except (ValueError, TypeError) as exc:
+            errors.append(checks.Error(str(exc), obj=self.model, id="django_hosts.E003"))
+        return errors
+
+    def _get_site_path(self):
+        site_path = self._site_path
+        if site_path is None:
+            key = (self.model, self._field_name)
+            site_path = self._site_paths.get(key)
+            if site_path is None:
+                site_path = self._site_paths[key] = self._validate_field_name()
+            self._site_path = site_path
+        return site_path
 
     def _validate_field_name(self):
         # If a custom name is provided, make sure the field exists on the model
         field = None
         if self._field_name is not None:
-            name_parts = self._field_name.split("__", 1)
-            rel_depth = len(name_parts)
-            if rel_depth > self._depth:
-                self._depth = rel_depth
+            name_parts = self._field_name.split("__")
             field_name = name_parts[0]
             try:
                 field = self.model._meta.get_field(field_name)
@@ -61,8 +100,8 @@ class HostSiteManager(models.Manager):
                 except FieldDoesNotExist:
                     field_name = None
                 else:
-                    self._field_name = field_name = potential_name
-                    self._is_validated = True
+                    field_name = potential_name
+                    name_parts = [potential_name]
                     break
         # Now do a type check on the field (FK or M2M only)
         if field:
@@ -73,15 +112,54 @@ class HostSiteManager(models.Manager):
                 "%s couldn't find a field named %s in %s."
                 % (self.__class__.__name__, field_name, self.model._meta.object_name)
             )
-        self._is_validated = True
+        # Then follow the rest of the relations, to select the objects
+        # related by foreign keys with joins and the others separately.
+        fields = [field]
+        for field_name in name_parts[1:]:
+            model = field.related_model
+            try:
+                field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                raise ValueError(
+                    "%s couldn't find a field named %s in %s."
+                    % (self.__class__.__name__, field_name, model._meta.object_name)
+                )
+            if not field.is_relation:
+                raise TypeError("%s must be a relation." % field_name)
+            fields.append(field)
+        depth = 0
+        for field in fields:
+            if not field.concrete or not (field.many_to_one or field.one_to_one):
+                break
+            depth += 1
+        # Foreign keys to the site are filtered by their column, without
+        # joining the site table.
+        if depth == len(fields):
+            filter_key = "__".join([*name_parts[:-1], field.attname])
+        else:
+            filter_key = "%s__id" % "__".join(name_parts)
+        return SitePath(
+            filter_key=filter_key,
+            select_related="__".join(name_parts[:depth]) or None,
+            prefetch_related="__".join(name_parts) if depth < len(fields) else None,
+        )
 
     def get_queryset(self, site_id=None):
         if site_id is None:
             site_id = settings.SITE_ID
-        if not self._is_validated:
-            self._validate_field_name()
+        site_path = self._get_site_path()
         qs = super().get_queryset()
-        return qs.filter(**{"%s__id__exact" % self._field_name: site_id})
+        if self._select_related:
+            if site_path.select_related is not None:
+                qs = qs.select_related(site_path.select_related)
+            if site_path.prefetch_related is not None:
+                qs = qs.prefetch_related(site_path.prefetch_related)
+        lookup = {site_path.filter_key: site_id}
+        if self._exists:
+            # Objects related to the site through many-to-many relations
+            # aren't duplicated, unlike with joins.
+            return qs.filter(models.Exists(self.model._base_manager.filter(pk=models.OuterRef("pk"), **lookup)))
+        return qs.filter(**lookup)
 
     def by_id(self, site_id=None):
         """
@@ -93,18 +171,30 @@ class HostSiteManager(models.Manager):
         """
         return self.get_queryset(site_id)
 
-    def by_request(self, request):
+    def by_request(self, request, lazy=False):
         """
         Returns a queryset matching the given request's site
         attribute.
 
+        If ``lazy`` is true and the site of one of the
+        :ref:`included callbacks <included-callbacks>` wasn't retrieved
+        yet, the queryset matches it with a subquery by domain instead of
+        retrieving it first, and is empty if there is no such site.
+
         :param request: the current request
         :type request: :class:`~django.http.HttpRequest`
+        :param lazy: whether to match the site without retrieving it
         :rtype: :class:`~django.db.models.query.QuerySet`
         """
         if not hasattr(request, "site") or request.site is None:
             return self.none()
-        return self.by_site(request.site)
+        site = request.site
+        if lazy and isinstance(site, callbacks.LazySite) and site._wrapped is empty:
+            from django.contrib.sites.models import Site
+
+            lookup = {"domain__%s" % callbacks.HOST_SITE_LOOKUP: site.get_host_domain()}
+            return self.by_id(models.Subquery(Site.objects.filter(**lookup).order_by().values("pk")[:1]))
+        return self.by_site(site)
 
     def by_site(self, site):
         """
@@ -1,9 +1,18 @@
+import re
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.http.request import split_domain_port
 from django.utils.deprecation import MiddlewareMixin
-from django.urls import NoReverseMatch, set_urlconf, get_urlconf
+from django.urls import NoReverseMatch, set_urlconf
+
+from .defaults import null_callback
+from .resolvers import get_host_patterns, get_host, get_host_match_cache, using_host
 
-from .resolvers import get_host_patterns, get_host
+# Patterns using numbered backreferences, conditionals or global inline
+# flags can't be merged into one alternation with other patterns.
+unmergeable_re = re.compile(r"\\[1-9]|\(\?\(\d|\(\?[aiLmsux]+\)")
 
 
 class HostsBaseMiddleware(MiddlewareMixin):
@@ -12,6 +21,8 @@ class HostsBaseMiddleware(MiddlewareMixin):
     settings.ROOT_HOSTCONF module.
     """
 
+    sync_capable = True
+    async_capable = True
     new_hosts_middleware = "django_hosts.middleware.HostsRequestMiddleware"
     toolbar_middleware = "debug_toolbar.middleware.DebugToolbarMiddleware"
 
@@ -19,6 +30,10 @@ class HostsBaseMiddleware(MiddlewareMixin):
         super().__init__(get_response)
         self.current_urlconf = None
         self.host_patterns = get_host_patterns()
+        self.literal_hosts, self.dynamic_hosts = self.index_host_patterns(self.host_patterns)
+        self.combined_hosts = None
+        if getattr(settings, "HOST_MATCH_COMBINED", False):
+            self.combined_hosts = self.combine_host_patterns(self.dynamic_hosts)
         try:
             self.default_host = get_host()
         except NoReverseMatch as exc:
@@ -38,32 +53,186 @@ class HostsBaseMiddleware(MiddlewareMixin):
                 "middleware in the MIDDLEWARE setting."
             )
 
-    def get_host(self, request_host):
-        for host in self.host_patterns:
-            match = host.compiled_regex.match(request_host)
+    @staticmethod
+    def index_host_patterns(host_patterns):
+        """
+        Splits the host patterns into a dict of literal hostnames and a
+        list of patterns that need regex matching, both remembering the
+        position of the host in the hostconf to keep first-match ordering.
+        """
+        literal_hosts = {}
+        dynamic_hosts = []
+        for index, host in enumerate(host_patterns):
+            if host.literal is None:
+                dynamic_hosts.append((index, host))
+            else:
+                literal_hosts.setdefault(host.literal, (index, host))
+        return literal_hosts, dynamic_hosts
+
+    @staticmethod
+    def combine_host_patterns(dynamic_hosts):
+        """
+        Merges consecutive dynamic host patterns into single regexes of
+        the form ``(?P<_host0>...)|(?P<_host1>...)``, the name of the
+        matching wrapper group telling which host matched.
+
+        A new regex is started whenever a pattern's group names clash
+        with the ones already merged, and patterns that can't be merged
+        at all are kept on their own, so the order of the hostconf is kept.
+        Returns a list of ``(index, regex, hosts)`` tuples, ``hosts``
+        mapping the wrapper group names to ``(index, host)`` tuples.
+        """
+        groups = []
+        names = None
+        for index, host in dynamic_hosts:
+            wrapper = "_host%d" % index
+            regex = host.compiled_regex
+            host_names = set(regex.groupindex)
+            mergeable = (
+                regex.flags == re.UNICODE and wrapper not in host_names and not unmergeable_re.search(regex.pattern)
+            )
+            if not mergeable:
+                groups.append([(wrapper, index, host)])
+                names = None
+                continue
+            if names is None or names & host_names:
+                groups.append([])
+                names = set()
+            groups[-1].append((wrapper, index, host))
+            names |= host_names | {wrapper}
+
+        combined_hosts = []
+        for group in groups:
+            if len(group) > 1:
+                try:
+                    regex = re.compile(
+                        "|".join(f"(?P<{wrapper}>{host.compiled_regex.pattern})" for wrapper, index, host in group)
+                    )
+                except re.error:
+                    pass
+                else:
+                    hosts = {wrapper: (index, host) for wrapper, index, host in group}
+                    combined_hosts.append((group[0][1], regex, hosts))
+                    continue
+            for wrapper, index, host in group:
+                combined_hosts.append((index, host.compiled_regex, {None: (index, host)}))
+        return combined_hosts
+
+    def get_literal_host(self, request_host):
+        if not self.literal_hosts:
+            return None
+        # Like the compiled regex, a literal hostname matches the whole
+        # request host or any part of it followed by a dot or a colon.
+        found = self.literal_hosts.get(request_host)
+        if found is not None:
+            found = (*found, len(request_host))
+        for pos, char in enumerate(request_host):
+            if char in ".:":
+                candidate = self.literal_hosts.get(request_host[:pos])
+                if candidate is not None and (found is None or candidate[0] < found[0]):
+                    found = (*candidate, pos + 1)
+        return found
+
+    def get_combined_host(self, request_host, before=None):
+        for first_index, regex, hosts in self.combined_hosts:
+            if before is not None and first_index > before:
+                break
+            match = regex.match(request_host)
             if match:
-                return host, match.groupdict()
-        return self.default_host, {}
+                if len(hosts) == 1:
+                    ((index, host),) = hosts.values()
+                    return index, host, match.groupdict(), match.end()
+                index, host = hosts[match.lastgroup]
+                if before is not None and index > before:
+                    break
+                kwargs = {name: match.group(name) for name in host.compiled_regex.groupindex}
+                return index, host, kwargs, match.end()
+        return None
+
+    def get_host(self, request_host):
+        host, kwargs, end = self.get_host_match(request_host)
+        return host, kwargs
+
+    def get_host_match(self, request_host):
+        """
+        Returns the matching host, its parameters and the length of the
+        part of the request host matched by its pattern, ``0`` for the
+        default host.
+        """
+        cache = get_host_match_cache()
+        if cache is None:
+            return self.match_host(request_host)
+        cached = cache.get(request_host)
+        if cached is None:
+            host, kwargs, end = self.match_host(request_host)
+            cached = (host, tuple(kwargs.items()), end)
+            cache.set(request_host, cached)
+        host, kwargs, end = cached
+        return host, dict(kwargs), end
+
+    def match_host(self, request_host):
+        literal = self.get_literal_host(request_host)
+        if self.combined_hosts is not None:
+            combined = self.get_combined_host(request_host, None if literal is None else literal[0])
+            if combined is not None:
+                return combined[1:]
+        else:
+            for index, host in self.dynamic_hosts:
+                if literal is not None and index > literal[0]:
+                    break
+                match = host.compiled_regex.match(request_host)
+                if match:
+                    return host, match.groupdict(), match.end()
+        if literal is not None:
+            return literal[1], {}, literal[2]
+        return self.default_host, {}, 0
 
 
 class HostsRequestMiddleware(HostsBaseMiddleware):
-    def process_request(self, request):
+    def set_request_host(self, request):
+        request_host = request.get_host()
         # Find best match, falling back to settings.DEFAULT_HOST
-        host, kwargs = self.get_host(request.get_host())
+        host, kwargs, end = self.get_host_match(request_host)
         # This is the main part of this middleware
         request.urlconf = host.urlconf
         request.host = host
+        request.host_kwargs = kwargs
+        # The lowercased host without port, e.g. for the host callbacks,
+        # if the host's pattern matched all of it and not just its start.
+        domain = split_domain_port(request_host)[0]
+        request.host_domain = domain if domain and end >= len(domain) else None
+        return host, kwargs
+
+    def process_request(self, request):
+        host, kwargs = self.set_request_host(request)
         # But we have to temporarily override the URLconf
         # already to allow correctly reversing host URLs in
-        # the host callback, if needed.
-        current_urlconf = get_urlconf()
-        try:
-            set_urlconf(host.urlconf)
-            return host.callback(request, **kwargs)
-        finally:
-            # Reset URLconf for this thread on the way out for complete
-            # isolation of request.urlconf
-            set_urlconf(current_urlconf)
+        # the host callback, if needed. It's reset on the way
+        # out for complete isolation of request.urlconf.
+        with using_host(host):
+            callback = host.callback
+            if iscoroutinefunction(callback):
+                return async_to_sync(callback)(request, **kwargs)
+            return callback(request, **kwargs)
+
+    async def aprocess_request(self, request):
+        host, kwargs = self.set_request_host(request)
+        callback = host.callback
+        if callback is null_callback:
+            return None
+        with using_host(host):
+            # Async callbacks are awaited right away, sync ones may do
+            # blocking I/O and are run in a thread.
+            if iscoroutinefunction(callback):
+                return await callback(request, **kwargs)
+            return await sync_to_async(callback, thread_sensitive=True)(request, **kwargs)
+
+    async def __acall__(self, request):
+        if type(self).process_request is not HostsRequestMiddleware.process_request:
+            # Run the process_request() of subclasses in a thread, as before.
+            return await super().__acall__(request)
+        response = await self.aprocess_request(request)
+        return response or await self.get_response(request)
 
 
 class HostsResponseMiddleware(HostsBaseMiddleware):
@@ -72,11 +241,25 @@ class HostsResponseMiddleware(HostsBaseMiddleware):
         # the response, so we need to set this again, in case
         # any of our middleware makes use of host, etc URLs.
 
-        # Find best match, falling back to settings.DEFAULT_HOST
-        host, kwargs = self.get_host(request.get_host())
+        # Reuse the host found by HostsRequestMiddleware, unless it
+        # didn't run, e.g. when an earlier middleware returned a response.
+        host = getattr(request, "host", None)
+        if host is None:
+            # Find best match, falling back to settings.DEFAULT_HOST
+            host, kwargs = self.get_host(request.get_host())
+            request.host = host
+            request.host_kwargs = kwargs
         # This is the main part of this middleware
         request.urlconf = host.urlconf
-        request.host = host
 
         set_urlconf(host.urlconf)
         return response
+
+    async def __acall__(self, request):
+        if type(self).process_response is not HostsResponseMiddleware.process_response:
+            # The process_response() of subclasses may block.
+            return await super().__acall__(request)
+        response = await self.get_response(request)
+        # Nothing blocks in process_response, so there's no need to
+        # run it in a thread like MiddlewareMixin does.
+        return self.process_response(request, response)
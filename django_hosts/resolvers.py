@@ -5,19 +5,30 @@ scheme, hostname and port you'll need to use the ``reverse`` and
 """
 
 import re
-from functools import lru_cache
+from collections.abc import Mapping
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from importlib import import_module
+from urllib.parse import quote
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.core.signals import setting_changed
-from django.urls import NoReverseMatch, reverse as reverse_path
+from django.urls import (
+    NoReverseMatch,
+    get_resolver,
+    get_script_prefix,
+    get_urlconf,
+    reverse as reverse_path,
+    set_urlconf,
+)
 from django.utils.encoding import iri_to_uri
 from django.utils.functional import lazy
-from django.utils.regex_helper import normalize
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
+from django.utils.translation import get_language
 
 from .defaults import host as host_cls
-from .utils import normalize_scheme, normalize_port
+from .utils import LRUCache, normalize_scheme, normalize_port
 
 
 @lru_cache
@@ -42,10 +53,10 @@ def get_host(name=None):
             name = settings.DEFAULT_HOST
         except AttributeError:
             raise ImproperlyConfigured("Missing DEFAULT_HOST setting")
-    for host in get_host_patterns():
-        if host.name == name:
-            return host
-    raise NoReverseMatch("No host called '%s' exists" % name)
+    try:
+        return get_host_index()[name]
+    except KeyError:
+        raise NoReverseMatch("No host called '%s' exists" % name)
 
 
 @lru_cache
@@ -58,21 +69,151 @@ def get_host_patterns():
         raise ImproperlyConfigured("Missing host_patterns in '%s'" % hostconf)
 
 
+@lru_cache
+def get_host_index():
+    """
+    Returns a dict mapping the names of the hosts to the host objects,
+    the first one winning in case of duplicate names.
+    """
+    index = {}
+    for host in get_host_patterns():
+        index.setdefault(host.name, host)
+    return index
+
+
+@lru_cache
+def get_parent_host():
+    return getattr(settings, "PARENT_HOST", "").lstrip(".")
+
+
+@lru_cache
+def get_host_match_cache():
+    """
+    Returns the cache of the hosts matched by the middleware for the
+    request's hosts, or ``None`` if the
+    :attr:`~django.conf.settings.HOST_MATCH_CACHE_SIZE` setting is not set.
+    Its ``cache_info()`` method returns the numbers of hits, misses and
+    evictions.
+    """
+    maxsize = getattr(settings, "HOST_MATCH_CACHE_SIZE", 0)
+    if not maxsize:
+        return None
+    return LRUCache(maxsize)
+
+
+@lru_cache
+def get_reverse_cache():
+    """
+    Returns the cache of the results of
+    :func:`~django_hosts.resolvers.reverse` and
+    :func:`~django_hosts.resolvers.reverse_host`, or ``None`` if the
+    :attr:`~django.conf.settings.HOST_REVERSE_CACHE_SIZE` setting is not set.
+    Its ``cache_info()`` method returns the numbers of hits, misses and
+    evictions.
+    """
+    maxsize = getattr(settings, "HOST_REVERSE_CACHE_SIZE", 0)
+    if not maxsize:
+        return None
+    return LRUCache(maxsize)
+
+
+def make_reverse_key(value):
+    """
+    Returns a hashable key of the given reverse argument which includes the
+    type of each value, as values of different types may be equal but
+    reversed differently, e.g. ``1``, ``1.0`` and ``True``. Raises
+    ``TypeError`` for values other than strings, integers, ``None`` and
+    lists, tuples and dicts of them.
+    """
+    cls = type(value)
+    if cls in {str, int, bool} or value is None:
+        return cls, value
+    if cls in {list, tuple}:
+        return cls, tuple(make_reverse_key(item) for item in value)
+    if cls is dict:
+        return cls, tuple(sorted((make_reverse_key(key), make_reverse_key(item)) for key, item in value.items()))
+    raise TypeError("%r can't be part of a reverse cache key" % cls)
+
+
+def memoize_reverse(func):
+    """
+    Caches the results of the decorated reverse function in the
+    :func:`~django_hosts.resolvers.get_reverse_cache` cache if it's
+    enabled and all arguments are strings, integers or ``None``, or lists,
+    tuples and dicts of them.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_reverse_cache()
+        if cache is None:
+            return func(*args, **kwargs)
+        try:
+            # The script prefix and the language are part of reversed paths.
+            key = (func, get_script_prefix(), get_language(), make_reverse_key(args), make_reverse_key(kwargs))
+        except TypeError:
+            return func(*args, **kwargs)
+        result = cache.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+        return result
+
+    return wrapper
+
+
 def clear_host_caches():
     get_hostconf.cache_clear()
     get_hostconf_module.cache_clear()
     get_host.cache_clear()
     get_host_patterns.cache_clear()
+    get_host_index.cache_clear()
+    get_parent_host.cache_clear()
+    get_host_match_cache.cache_clear()
+    get_reverse_cache.cache_clear()
 
 
 def setting_changed_receiver(setting, enter, **kwargs):
-    if setting in {"ROOT_HOSTCONF", "DEFAULT_HOST"}:
+    if setting in {"ROOT_HOSTCONF", "DEFAULT_HOST", "PARENT_HOST", "HOST_MATCH_CACHE_SIZE"}:
         clear_host_caches()
+    else:
+        # Reversed URLs depend on the URLconfs and many other settings.
+        get_reverse_cache.cache_clear()
 
 
 setting_changed.connect(setting_changed_receiver)
 
 
+@contextmanager
+def using_host(host):
+    """
+    A context manager to temporarily use the URLconf of the given host,
+    e.g.::
+
+        >>> from django.urls import reverse
+        >>> from django_hosts.resolvers import using_host
+        >>> with using_host('api'):
+        ...     reverse('api-root')
+        '/v1/'
+
+    Django stores the current URLconf in a context variable, so it is
+    changed for the current thread or asyncio task only and concurrent
+    async requests don't see each other's URLconf.
+
+    :param host: the name of the host or the host object
+    :rtype: the host object
+    """
+    if not isinstance(host, host_cls):
+        host = get_host(host)
+    current_urlconf = get_urlconf()
+    set_urlconf(host.urlconf)
+    try:
+        yield host
+    finally:
+        set_urlconf(current_urlconf)
+
+
+@memoize_reverse
 def reverse_host(host, args=None, kwargs=None):
     """
     Given the host name and the appropriate parameters,
@@ -101,7 +242,7 @@ def reverse_host(host, args=None, kwargs=None):
     if not isinstance(host, host_cls):
         host = get_host(host)
 
-    for result, params in normalize(host.regex):
+    for result, params in host.reverse_templates:
         if args:
             if len(args) != len(params):
                 continue
@@ -111,8 +252,8 @@ def reverse_host(host, args=None, kwargs=None):
                 continue
             candidate = result % kwargs
 
-        if re.match(host.regex, candidate):  # pragma: no cover
-            parent_host = getattr(settings, "PARENT_HOST", "").lstrip(".")
+        if host.reverse_regex.match(candidate):  # pragma: no cover
+            parent_host = get_parent_host()
             if parent_host:
                 # only add the parent host when needed (aka www-less domain)
                 if candidate and candidate != parent_host:
@@ -132,6 +273,7 @@ def reverse_host(host, args=None, kwargs=None):
 reverse_host_lazy = lazy(reverse_host, str)
 
 
+@memoize_reverse
 def reverse(
     viewname,
     args=None,
@@ -180,7 +322,6 @@ def reverse(
     :rtype: the fully qualified URL with path
     """
     host = get_host(host)
-    hostname = reverse_host(host, args=host_args, kwargs=host_kwargs)
     path = reverse_path(
         viewname,
         urlconf=host.urlconf,
@@ -188,6 +329,21 @@ def reverse(
         kwargs=kwargs or {},
         current_app=current_app,
     )
+    return reverse_url_prefix(host, host_args, host_kwargs, scheme, port) + path
+
+
+def reverse_url_prefix(host, args=None, kwargs=None, scheme=None, port=None):
+    """
+    Returns the scheme, host name and port part of the URLs of the given
+    host object, with the parameters of
+    :func:`~django_hosts.resolvers.reverse`.
+    """
+    if scheme is None and port is None and not args and not kwargs:
+        url_prefix = host.url_prefix
+        if url_prefix is not None:
+            return url_prefix
+
+    hostname = reverse_host(host, args=args, kwargs=kwargs)
     if scheme is None:
         scheme = host.scheme
     else:
@@ -198,9 +354,137 @@ def reverse(
     else:
         port = normalize_port(port)
 
-    return iri_to_uri(f"{scheme}{hostname}{port}{path}")
+    return iri_to_uri(f"{scheme}{hostname}{port}")
 
 
 #: The lazy version of the :func:`~django_hosts.resolvers.reverse`
 #: function to be used in class based views and other module level situations
 reverse_lazy = lazy(reverse, str)
+
+
+def get_path_reverser(viewname, urlconf):
+    """
+    Returns a function reversing the path of the given view in the given
+    URLconf for ``(args, kwargs)``, with the URL patterns of the view
+    looked up and their regexes compiled once, following
+    :func:`django.urls.reverse`. Namespaced view names aren't supported.
+    """
+    resolver = get_resolver(urlconf)
+    script_prefix = get_script_prefix()
+    candidates = []
+    for possibility, pattern, defaults, converters in resolver.reverse_dict.getlist(viewname):
+        regex = re.compile("^%s%s" % (re.escape(script_prefix), pattern))
+        for result, params in possibility:
+            candidates.append((script_prefix.replace("%", "%%") + result, params, defaults, converters, regex))
+
+    def reverse_args(args, kwargs):
+        if args and kwargs:
+            raise ValueError("Don't mix *args and **kwargs in call to reverse()!")
+        for result, params, defaults, converters, regex in candidates:
+            if args:
+                if len(args) != len(params):
+                    continue
+                candidate_subs = dict(zip(params, args))
+            else:
+                if set(kwargs).symmetric_difference(params).difference(defaults):
+                    continue
+                if any(kwargs.get(k, v) != v for k, v in defaults.items() if k not in params):
+                    continue
+                candidate_subs = kwargs
+            text_candidate_subs = {}
+            for k, v in candidate_subs.items():
+                if k in converters:
+                    try:
+                        text_candidate_subs[k] = converters[k].to_url(v)
+                    except ValueError:
+                        break
+                else:
+                    text_candidate_subs[k] = str(v)
+            else:
+                url = result % text_candidate_subs
+                if regex.search(url):
+                    return escape_leading_slashes(quote(url, safe=RFC3986_SUBDELIMS + "/~:@"))
+        # Let Django raise a helpful error message.
+        return resolver._reverse_with_prefix(viewname, script_prefix, *args, **kwargs)
+
+    return reverse_args
+
+
+def split_arguments(arguments):
+    """
+    Returns the arguments and keyed arguments of the given sequence of
+    arguments or mapping of keyed arguments.
+    """
+    if isinstance(arguments, Mapping):
+        return (), arguments
+    if isinstance(arguments, str):
+        # A string is a sequence, but surely not one of arguments.
+        raise TypeError("Expected a sequence or mapping of arguments, got %r" % arguments)
+    return arguments, {}
+
+
+def reverse_many(
+    viewname,
+    args_list,
+    current_app=None,
+    host=None,
+    host_args_fn=None,
+    scheme=None,
+    port=None,
+):
+    """
+    Given the host and view name, reverses the fully qualified URLs for
+    each of the given view arguments, e.g. when generating sitemaps::
+
+        >>> from django_hosts.resolvers import reverse_many
+        >>> urls = reverse_many('repo', [('django',), ('django-hosts',)], host='www')
+        >>> list(urls)
+        ['//www.example.com/repo/django/', '//www.example.com/repo/django-hosts/']
+
+    This is a lot faster than calling
+    :func:`~django_hosts.resolvers.reverse` for each of the view
+    arguments, as the host, the URL prefix (unless ``host_args_fn`` is
+    given) and the URL patterns of the view are only looked up once.
+
+    :param viewname: the name of the view
+    :param args_list: an iterable of view arguments, each either a sequence
+                      (e.g. a tuple or list, not a string) of arguments or
+                      a mapping of keyed arguments
+    :param current_app: the current_app argument
+    :param host: the name of the host
+    :param host_args_fn: a callable returning the host arguments for each
+                         item of ``args_list``, either a sequence of
+                         arguments or a mapping of keyed arguments
+    :param scheme: the scheme to use
+    :param port: the port to use
+    :raises django.core.urlresolvers.NoReverseMatch: if no host or path matches
+    :raises TypeError: if view or host arguments are strings
+    :rtype: a generator of fully qualified URLs with paths
+    """
+    host = get_host(host)
+    scheme = host.scheme if scheme is None else normalize_scheme(scheme)
+    port = host.port if port is None else normalize_port(port)
+    url_prefix = None
+    if host_args_fn is None:
+        url_prefix = iri_to_uri(f"{scheme}{reverse_host(host)}{port}")
+
+    if isinstance(viewname, str) and ":" in viewname:
+        # Leave resolving namespaces to Django.
+        def reverse_item(args, kwargs):
+            return reverse_path(viewname, urlconf=host.urlconf, args=args, kwargs=kwargs, current_app=current_app)
+
+    else:
+        reverse_item = get_path_reverser(viewname, host.urlconf)
+
+    def generate():
+        for item in args_list:
+            args, kwargs = split_arguments(item)
+            path = reverse_item(args, kwargs)
+            if host_args_fn is None:
+                yield url_prefix + path
+                continue
+            args, kwargs = split_arguments(host_args_fn(item))
+            hostname = reverse_host(host, args=args, kwargs=kwargs)
+            yield iri_to_uri(f"{scheme}{hostname}{port}") + path
+
+    return generate()
@@ -1,20 +1,45 @@
 import re
+import weakref
 
 from django import template
 from django.conf import settings
-from django.template import TemplateSyntaxError
-from django.template.base import FilterExpression
+from django.core.signals import setting_changed
+from django.template import Context, TemplateSyntaxError
+from django.template.base import FilterExpression, Variable
 from django.template.defaulttags import URLNode
+from django.urls import get_script_prefix
 from django.utils.encoding import iri_to_uri, smart_str
-from django.urls import set_urlconf, get_urlconf
+from django.utils.translation import get_language
 
-from ..resolvers import reverse_host, get_host
+from ..resolvers import reverse_host, get_host, make_reverse_key, using_host
 from ..utils import normalize_scheme, normalize_port
 
 register = template.Library()
 
 kwarg_re = re.compile(r"(?:(\w+)=)?(.+)")
 
+#: The nodes remembering the URLs they rendered, to be reset
+#: when the settings change, e.g. in tests.
+url_nodes = weakref.WeakSet()
+
+
+def is_literal(value):
+    """
+    Returns whether the given tag argument doesn't depend on the
+    template context, e.g. a string or number without filters.
+    """
+    if not isinstance(value, FilterExpression):
+        return True
+    if value.filters:
+        return False
+    return not isinstance(value.var, Variable) or value.var.lookups is None
+
+
+def resolve_literal(value):
+    if isinstance(value, FilterExpression):
+        return value.resolve(Context())
+    return value
+
 
 class HostURLNode(URLNode):
 
@@ -25,6 +50,24 @@ class HostURLNode(URLNode):
         self.scheme = kwargs.pop("scheme")
         self.port = kwargs.pop("port")
         super().__init__(*args, **kwargs)
+        # The URLs of nodes with literal arguments only are computed
+        # once per script prefix and language, see render().
+        self.urls = None
+        arguments = [
+            self.view_name,
+            *self.args,
+            *self.kwargs.values(),
+            self.host,
+            *self.host_args,
+            *self.host_kwargs.values(),
+            self.scheme,
+            self.port,
+        ]
+        if all(is_literal(argument) for argument in arguments):
+            view_name = resolve_literal(self.view_name)
+            if not isinstance(view_name, str) or ":" not in view_name:
+                self.urls = {}
+                url_nodes.add(self)
 
     def maybe_resolve(self, var, context):
         """
@@ -37,34 +80,62 @@ class HostURLNode(URLNode):
         return var
 
     def render(self, context):
+        if self.urls is None:
+            return self.render_uri(context, self.get_uri(context))
+        key = (get_script_prefix(), get_language(), context.autoescape)
+        uri = self.urls.get(key)
+        if uri is None:
+            uri = self.urls[key] = self.get_uri(context)
+        return self.render_uri(context, uri)
+
+    def get_uri(self, context):
         host = get_host(self.maybe_resolve(self.host, context))
-        current_urlconf = get_urlconf()
-        try:
-            set_urlconf(host.urlconf)
+        with using_host(host):
             path = super().render(context)
             if self.asvar:
                 path = context[self.asvar]
-        finally:
-            set_urlconf(current_urlconf)
+
+        if not self.host_args and not self.host_kwargs and self.scheme is None and self.port is None:
+            url_prefix = host.url_prefix
+            if url_prefix is not None:
+                return url_prefix + path
 
         host_args = [self.maybe_resolve(x, context) for x in self.host_args]
 
         host_kwargs = {smart_str(k, "ascii"): self.maybe_resolve(v, context) for k, v in self.host_kwargs.items()}
 
-        if self.scheme:
-            scheme = normalize_scheme(self.maybe_resolve(self.scheme, context))
+        # Literal schemes and ports are normalized by the host_url tag already.
+        if isinstance(self.scheme, FilterExpression):
+            scheme = normalize_scheme(self.scheme.resolve(context))
+        elif self.scheme is not None:
+            scheme = self.scheme
         else:
             scheme = host.scheme
 
-        if self.port:
-            port = normalize_port(self.maybe_resolve(self.port, context))
+        if isinstance(self.port, FilterExpression):
+            port = normalize_port(self.port.resolve(context))
+        elif self.port is not None:
+            port = self.port
         else:
             port = host.port
 
-        hostname = reverse_host(host, args=host_args, kwargs=host_kwargs)
-
-        uri = iri_to_uri(f"{scheme}{hostname}{port}{path}")
-
+        # Within a render, e.g. in a loop, the host part of the URL is
+        # only computed once for the same host arguments, of the same types.
+        url_prefixes = context.render_context.setdefault(self, {})
+        try:
+            key = (host, make_reverse_key(host_args), make_reverse_key(host_kwargs), scheme, port)
+            url_prefix = url_prefixes.get(key)
+        except TypeError:
+            key = url_prefix = None
+        if url_prefix is None:
+            hostname = reverse_host(host, args=host_args, kwargs=host_kwargs)
+            url_prefix = iri_to_uri(f"{scheme}{hostname}{port}")
+            if key is not None:
+                url_prefixes[key] = url_prefix
+
+        return url_prefix + path
+
+    def render_uri(self, context, uri):
         if self.asvar:
             context[self.asvar] = uri
             return ""
@@ -72,6 +143,14 @@ class HostURLNode(URLNode):
             return uri
 
 
+def setting_changed_receiver(setting, enter, **kwargs):
+    for node in list(url_nodes):
+        node.urls.clear()
+
+
+setting_changed.connect(setting_changed_receiver)
+
+
 def parse_params(name, parser, bits):
     args = []
     kwargs = {}
@@ -124,9 +203,13 @@ def host_url(parser, token):
     scheme, pivot, bits = fetch_arg(name, "scheme", bits)
     if scheme:
         scheme = parser.compile_filter(scheme)
+        if is_literal(scheme):
+            scheme = normalize_scheme(resolve_literal(scheme))
     port, pivot, bits = fetch_arg(name, "port", bits)
     if port:
         port = parser.compile_filter(port)
+        if is_literal(port):
+            port = normalize_port(str(resolve_literal(port)))
 
     host, pivot, bits = fetch_arg(name, "host", bits, consume=False)
 
@@ -140,6 +223,10 @@ def host_url(parser, token):
         view_args, view_kwargs = parse_params(name, parser, bits[1:])
         host_args, host_kwargs = (), {}
 
+    # Literal host names are looked up when rendering, as the hosts
+    # may change, e.g. with the ROOT_HOSTCONF setting.
+    host = resolve_literal(host) if is_literal(host) else host
+
     return HostURLNode(
         view_name=view_name,
         args=view_args,
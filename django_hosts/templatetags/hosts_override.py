@@ -5,11 +5,40 @@ by adding ``'django_hosts.templatetags.hosts_override'`` to the
 """
 
 from django import template
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.template import defaulttags
+from django.template.defaulttags import URLNode
 
-from .hosts import host_url
+from ..resolvers import get_host, reverse_url_prefix, using_host
+from .hosts import fetch_arg, host_url
 
 register = template.Library()
 
+URL_MODES = {"host", "default_host", "path"}
+
+
+class DefaultHostURLNode(URLNode):
+    """
+    Renders the URL of a view of the default host, without any of the
+    host parameters handling of
+    :class:`~django_hosts.templatetags.hosts.HostURLNode`.
+    """
+
+    def render(self, context):
+        host = get_host()
+        # Reverses hosts with optional parameters only, and raises a
+        # NoReverseMatch about missing host parameters.
+        url_prefix = reverse_url_prefix(host)
+        with using_host(host):
+            path = super().render(context)
+            if self.asvar:
+                path = context[self.asvar]
+        if self.asvar:
+            context[self.asvar] = url_prefix + path
+            return ""
+        return url_prefix + path
+
 
 @register.tag
 def url(parser, token):
@@ -23,5 +52,22 @@ def url(parser, token):
     {% url 'view-name' host 'host-name' as url_on_host_variable %}
     {% url 'view-name' varg1=vvalue1 host 'host-name' 'spam' 'hvalue1' %}
     {% url 'view-name' vvalue2 host 'host-name' 'spam' harg2=hvalue2 %}
+
+    How the tag handles URLs without host, scheme and port parameters
+    depends on the :attr:`~django.conf.settings.HOST_OVERRIDE_URL_MODE`
+    setting.
     """
+    mode = getattr(settings, "HOST_OVERRIDE_URL_MODE", "host")
+    if mode not in URL_MODES:
+        raise ImproperlyConfigured(
+            "Invalid HOST_OVERRIDE_URL_MODE setting: %r, must be one of %s." % (mode, ", ".join(sorted(URL_MODES)))
+        )
+    if mode != "host":
+        bits = token.split_contents()
+        asvar, pivot, bits = fetch_arg(bits[0], "as", bits[1:])
+        if not {"host", "scheme", "port"}.intersection(bits[1:]):
+            node = defaulttags.url(parser, token)
+            if mode == "default_host":
+                node = DefaultHostURLNode(node.view_name, node.args, node.kwargs, node.asvar)
+            return node
     return host_url(parser, token)
@@ -1,3 +1,12 @@
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+REGEX_METACHARS = frozenset(".^$*+?{}[]|()")
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
 def normalize_scheme(scheme=None, default="//"):
     if scheme is None:
         scheme = default
@@ -16,3 +25,113 @@ def normalize_port(port=None):
     elif port:
         port = ":%s" % port
     return port
+
+
+def normalize_domain(domain):
+    """
+    Returns the given domain name lowercased, without trailing dot and
+    with internationalized domain names encoded with IDNA.
+    """
+    domain = domain.lower().rstrip(".")
+    if not domain.isascii():
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+    return domain
+
+
+def regex_literal(regex):
+    """
+    Returns the string matched by the given regular expression if it
+    consists of plain or escaped characters only, otherwise ``None``.
+    """
+    if regex.startswith("^"):
+        regex = regex[1:]
+    literal = []
+    chars = iter(regex)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            if not char or char.isalnum():
+                return None
+        elif char in REGEX_METACHARS:
+            return None
+        literal.append(char)
+    return "".join(literal)
+
+
+class LRUCache:
+    """
+    A thread-safe mapping of limited size discarding the least recently
+    used entries first, counting hits, misses and evictions.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+
+class KeyLock:
+    """
+    Thread locks by key, created on demand and discarded when no thread
+    uses them anymore, e.g.::
+
+        key_lock = KeyLock()
+        with key_lock("spam", blocking=False) as acquired:
+            if acquired:
+                ...
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def __call__(self, key, blocking=True):
+        with self._lock:
+            lock, users = self._locks.get(key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._locks[key] = (lock, users + 1)
+        acquired = lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+            with self._lock:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
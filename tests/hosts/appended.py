@@ -4,4 +4,5 @@ from tests.hosts.simple import host_patterns
 host_patterns += patterns(
     "",
     host(r"special", "tests.urls.simple", name="special"),
+    host(r"(?P<subdomain>\w+)?", "tests.urls.simple", name="optional"),
 )
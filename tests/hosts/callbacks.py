@@ -0,0 +1,36 @@
+from django.http import HttpResponse
+from django.urls import get_urlconf
+
+from django_hosts import patterns, host
+
+
+def sync_callback(request, name):
+    request.callback_urlconf = get_urlconf()
+    request.callback_name = name
+
+
+async def async_callback(request, name):
+    request.callback_urlconf = get_urlconf()
+    request.callback_name = name
+    if name == "stop":
+        return HttpResponse("stopped")
+
+
+host_patterns = patterns(
+    "",
+    host(r"sync-(?P<name>\w+)", "tests.urls.simple", callback=sync_callback, name="sync"),
+    host(r"async-(?P<name>\w+)", "tests.urls.multiple", callback=async_callback, name="async"),
+    host(
+        r"asite\.(?P<domain>\w+)",
+        "tests.urls.simple",
+        callback="django_hosts.callbacks.async_host_site",
+        name="async-site",
+    ),
+    host(
+        r"acached\.(?P<domain>\w+)",
+        "tests.urls.simple",
+        callback="django_hosts.callbacks.async_cached_host_site",
+        name="async-cached-site",
+    ),
+    host(r"www", "tests.urls.simple", name="www"),
+)
@@ -18,6 +18,18 @@ host_patterns = patterns(
         callback="django_hosts.callbacks.cached_host_site",
         name="with_cached_callback",
     ),
+    host(
+        r"local\.(?P<domain>\w+)",
+        "tests.urls.simple",
+        callback="django_hosts.callbacks.local_cached_host_site",
+        name="with_local_cached_callback",
+    ),
+    host(
+        r"preloaded\.(?P<domain>\w+)",
+        "tests.urls.simple",
+        callback="django_hosts.callbacks.preloaded_host_site",
+        name="with_preloaded_callback",
+    ),
     host(r"(?P<username>\w+)", "tests.urls.simple", name="with_kwargs"),
     host(r"(\w+)", "tests.urls.simple", name="with_args"),
     host(r"scheme", "tests.urls.simple", name="scheme", scheme="https://"),
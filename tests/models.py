@@ -33,3 +33,20 @@ class WikiPage(models.Model):
 
     def __unicode__(self):
         return str(self.id)
+
+
+class Event(models.Model):
+    name = models.TextField()
+    sites = models.ManyToManyField(Site)
+
+    objects = models.Manager()
+    on_site = HostSiteManager()
+    exists_on_site = HostSiteManager(exists=True)
+
+
+class Talk(models.Model):
+    title = models.TextField()
+    event = models.ForeignKey(Event, models.CASCADE)
+
+    objects = models.Manager()
+    on_site = HostSiteManager("event__sites")
@@ -1,5 +1,5 @@
 from django.core.exceptions import ImproperlyConfigured
-from django_hosts.defaults import host, patterns
+from django_hosts.defaults import host, null_callback, patterns
 from django_hosts.resolvers import get_host_patterns
 
 from .base import HostsTestCase
@@ -51,6 +51,31 @@ class HostTests(HostsTestCase):
         api_host = host(r"api", "api.urls", name="api", prefix="spam.eggs")
         self.assertEqual(api_host.urlconf, "spam.eggs.api.urls")
 
+    def test_host_reverse_templates(self):
+        user_host = host(r"(?P<username>\w+)\.users", "users.urls", name="users")
+        self.assertEqual(user_host.reverse_templates, [("%(username)s.users", ["username"])])
+        self.assertIs(user_host.reverse_templates, user_host.reverse_templates)
+        self.assertTrue(user_host.reverse_regex.match("johndoe.users"))
+        self.assertFalse(user_host.reverse_regex.match("-.users"))
+
+    def test_host_url_prefix(self):
+        api_host = host(r"api", "api.urls", name="api", port="8000")
+        self.assertEqual(api_host.hostname, "api")
+        self.assertEqual(api_host.url_prefix, "//api:8000")
+        with self.settings(PARENT_HOST="example.com", HOST_SCHEME="https"):
+            self.assertEqual(api_host.hostname, "api.example.com")
+            self.assertEqual(api_host.url_prefix, "https://api.example.com:8000")
+        self.assertEqual(api_host.url_prefix, "//api:8000")
+
+    def test_host_url_prefix_with_parameters(self):
+        user_host = host(r"(?P<username>\w+)", "users.urls", name="users")
+        self.assertIsNone(user_host.hostname)
+        self.assertIsNone(user_host.url_prefix)
+
+    def test_host_without_callback(self):
+        api_host = host(r"api", "api.urls", name="api")
+        self.assertIs(api_host.callback, null_callback)
+
     def test_host_string_callback(self):
         api_host = host(
             r"api",
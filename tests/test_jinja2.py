@@ -0,0 +1,102 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from django.contrib.sites.models import Site
+from django.test.utils import override_settings
+from django.urls import NoReverseMatch
+from django_hosts.resolvers import reverse_host
+
+from .base import HostsTestCase
+from .test_resolvers import Unhashable
+
+jinja2 = pytest.importorskip("jinja2")
+
+from django_hosts.jinja2 import HostsExtension, url_prefixes  # noqa: E402
+
+
+@override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+class Jinja2Tests(HostsTestCase):
+
+    def render(self, source, **context):
+        environment = jinja2.Environment(extensions=[HostsExtension])
+        return environment.from_string(source).render(**context)
+
+    def test_host_url(self):
+        self.assertEqual(self.render("{{ host_url('simple-direct') }}"), "//www.example.com/simple/")
+        self.assertEqual(
+            self.render("{{ host_url('simple-direct', host='static') }}"),
+            "//static/simple/",
+        )
+        self.assertEqual(
+            self.render("{{ host_url('simple-direct', host='www', scheme='https', port='8000') }}"),
+            "https://www.example.com:8000/simple/",
+        )
+        self.assertEqual(
+            self.render("{{ host_url('simple-direct', host='with_args', host_args=[name]) }}", name="spam"),
+            "//spam/simple/",
+        )
+        self.assertEqual(
+            self.render(
+                "{{ host_url('simple-direct', host='with_kwargs', host_kwargs={'username': 'spam'}) }}",
+            ),
+            "//spam/simple/",
+        )
+
+    @override_settings(DEFAULT_HOST="with_view_kwargs")
+    def test_host_url_view_arguments(self):
+        self.assertEqual(
+            self.render(
+                "{% for pk in pks %}{{ host_url('complex-item', pk, host_args=['pam']) }} {% endfor %}",
+                pks=[1, 2],
+            ),
+            "//spam/item/1/ //spam/item/2/ ",
+        )
+        self.assertEqual(
+            self.render("{{ host_url('complex-direct', template='eggs', host_kwargs={'subdomain': 'pam'}) }}"),
+            "//spam/template/eggs/",
+        )
+
+    def test_host_url_errors(self):
+        with self.assertRaises(NoReverseMatch):
+            self.render("{{ host_url('simple-direct', host='spam') }}")
+        with self.assertRaises(NoReverseMatch):
+            self.render("{{ host_url('spam') }}")
+
+    def test_host_url_async(self):
+        environment = jinja2.Environment(extensions=[HostsExtension], enable_async=True)
+        template = environment.from_string("{{ host_url('simple-direct', host='static') }}")
+        self.assertEqual(asyncio.run(template.render_async()), "//static/simple/")
+
+    def test_host_url_prefixes(self):
+        url_prefixes.clear()
+        with mock.patch("django_hosts.resolvers.reverse_host", wraps=reverse_host) as mocked:
+            rendered = self.render(
+                "{% for name in names %}{{ host_url('simple-direct', host='with_args', host_args=[name]) }} "
+                "{% endfor %}",
+                names=["spam", "eggs", "spam"],
+            )
+        self.assertEqual(rendered, "//spam/simple/ //eggs/simple/ //spam/simple/ ")
+        self.assertEqual(mocked.call_count, 2)
+        self.assertEqual(url_prefixes.cache_info().hits, 1)
+
+    def test_host_url_prefixes_typed(self):
+        url_prefixes.clear()
+        source = "{{ host_url('simple-direct', host='with_args', host_args=[arg]) }}"
+        self.assertEqual(self.render(source, arg=1), "//1/simple/")
+        self.assertEqual(self.render(source, arg=True), "//True/simple/")
+        self.assertEqual(self.render(source, arg=1), "//1/simple/")
+        self.assertEqual(url_prefixes.cache_info()[:2], (1, 2))
+
+    def test_host_url_prefixes_model_instance(self):
+        # Model instances are equal by primary key, so aren't cached.
+        source = "{{ host_url('simple-direct', host='with_args', host_args=[site]) }}"
+        self.assertEqual(self.render(source, site=Site(pk=1, domain="alice")), "//alice/simple/")
+        self.assertEqual(self.render(source, site=Site(pk=1, domain="bob")), "//bob/simple/")
+
+        # Unhashable host arguments aren't cached.
+        self.assertEqual(
+            self.render("{{ host_url('simple-direct', host='with_args', host_args=[name]) }}", name=Unhashable("ham")),
+            "//ham/simple/",
+        )
+        self.assertEqual(url_prefixes.cache_info().currsize, 2)
@@ -7,7 +7,9 @@ from django.test.utils import override_settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.decorators import async_only_middleware
 
-from django_hosts.middleware import HostsRequestMiddleware, HostsResponseMiddleware
+from django_hosts.defaults import host
+from django_hosts.middleware import HostsBaseMiddleware, HostsRequestMiddleware, HostsResponseMiddleware
+from django_hosts.resolvers import get_host_match_cache
 
 from .base import HostsTestCase
 
@@ -87,6 +89,25 @@ class MiddlewareTests(HostsTestCase):
         middleware.process_response(request, HttpResponse("test"))
         self.assertEqual(request.urlconf, "tests.urls.simple")
 
+    @override_settings(
+        ALLOWED_HOSTS=["wiki.site1"],
+        ROOT_HOSTCONF="tests.hosts.simple",
+        DEFAULT_HOST="www",
+    )
+    def test_response_reuses_request_host(self):
+        rf = RequestFactory(headers={"host": "wiki.site1"})
+        request = rf.get("/simple/")
+        HostsRequestMiddleware(get_response_empty).process_request(request)
+        self.assertEqual(request.host.name, "with_callback")
+        self.assertEqual(request.host_kwargs, {"domain": "site1"})
+        self.assertEqual(request.host_domain, "wiki.site1")
+        middleware = HostsResponseMiddleware(get_response_empty)
+        # the host isn't matched a second time, so not validated either
+        with self.settings(ALLOWED_HOSTS=[]):
+            middleware.process_response(request, HttpResponse("test"))
+        self.assertEqual(request.urlconf, "tests.urls.simple")
+        self.assertEqual(request.host.name, "with_callback")
+
     @override_settings(
         ALLOWED_HOSTS=["ss.example.com"],
         ROOT_HOSTCONF="tests.hosts.simple",
@@ -101,6 +122,126 @@ class MiddlewareTests(HostsTestCase):
         host, kwargs = middleware.get_host("non-existing")
         self.assertEqual(host.name, "with_view_kwargs")
 
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_literal_hosts_index(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        self.assertEqual(middleware.literal_hosts["static"][1].name, "static")
+        self.assertEqual(middleware.literal_hosts["www.example.com"][1].name, "www")
+        self.assertNotIn("with_kwargs", [host.name for index, host in middleware.literal_hosts.values()])
+        for request_host, name, kwargs in [
+            ("static", "static", {}),
+            ("static:8000", "static", {}),
+            ("static.example.com", "static", {}),
+            ("www.example.com", "www", {}),
+            ("example.com.evil", "without_www", {}),
+            # dynamic patterns defined before a literal one win
+            ("port", "with_kwargs", {"username": "port"}),
+            ("wiki.site1", "with_callback", {"domain": "site1"}),
+            ("", "www", {}),
+        ]:
+            with self.subTest(request_host=request_host):
+                host, host_kwargs = middleware.get_host(request_host)
+                self.assertEqual(host.name, name)
+                self.assertEqual(host_kwargs, kwargs)
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www", ALLOWED_HOSTS=["*"])
+    def test_host_domain(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        for request_host, host_domain in [
+            ("static", "static"),
+            ("static:8000", "static"),
+            ("static.", "static"),
+            ("static.example.com", None),
+            ("www.example.com", "www.example.com"),
+            ("wiki.Site1:8000", "wiki.site1"),
+            ("wiki.site1.", "wiki.site1"),
+            ("wiki.site1.example.com", None),
+            # the default host
+            ("-", None),
+        ]:
+            with self.subTest(request_host=request_host):
+                request = RequestFactory(headers={"host": request_host}).get("/simple/")
+                middleware.process_request(request)
+                self.assertEqual(request.host_domain, host_domain)
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.blank", DEFAULT_HOST="blank_or_www", PARENT_HOST="example.com")
+    def test_literal_hosts_parent_host(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        self.assertEqual(middleware.literal_hosts[".example.com"][1].name, "blank")
+        host, kwargs = middleware.get_host(".example.com")
+        self.assertEqual(host.name, "blank")
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_combined_hosts(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        self.assertIsNone(middleware.combined_hosts)
+        with self.settings(HOST_MATCH_COMBINED=True):
+            combined_middleware = HostsRequestMiddleware(get_response_empty)
+        # the four "domain" groups clash, so four regexes are needed
+        self.assertEqual(
+            [
+                [host.name for index, host in hosts.values()]
+                for index, regex, hosts in combined_middleware.combined_hosts
+            ],
+            [
+                ["with_view_kwargs", "with_callback"],
+                ["with_cached_callback"],
+                ["with_local_cached_callback"],
+                ["with_preloaded_callback", "with_kwargs", "with_args"],
+            ],
+        )
+        for request_host in [
+            "static",
+            "stest",
+            "wiki.site1",
+            "admin.site4:8000",
+            "port",
+            "www.example.com",
+            "-",
+            "",
+        ]:
+            with self.subTest(request_host=request_host):
+                self.assertEqual(
+                    combined_middleware.get_host_match(request_host),
+                    middleware.get_host_match(request_host),
+                )
+
+    def test_combine_unmergeable_host_patterns(self):
+        dynamic_hosts = list(
+            enumerate(
+                [
+                    host(r"(?P<tenant>\w+)\.eu", "tests.urls.simple", name="eu"),
+                    host(r"(\w+)-\1", "tests.urls.simple", name="backref"),
+                    host(r"(?P<tenant>\w+)\.us", "tests.urls.simple", name="us"),
+                    host(r"(?P<region>\w+)\.(?P=region)", "tests.urls.simple", name="named_backref"),
+                ]
+            )
+        )
+        combined_hosts = HostsBaseMiddleware.combine_host_patterns(dynamic_hosts)
+        self.assertEqual(
+            [[host.name for index, host in hosts.values()] for index, regex, hosts in combined_hosts],
+            [["eu"], ["backref"], ["us", "named_backref"]],
+        )
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www", HOST_MATCH_CACHE_SIZE=2)
+    def test_host_match_cache(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        cache = get_host_match_cache()
+        host, kwargs = middleware.get_host("wiki.site1")
+        self.assertEqual((host.name, kwargs), ("with_callback", {"domain": "site1"}))
+        kwargs["domain"] = "changed"
+        host, kwargs = middleware.get_host("wiki.site1")
+        self.assertEqual((host.name, kwargs), ("with_callback", {"domain": "site1"}))
+        middleware.get_host("static")
+        middleware.get_host("stest")
+        self.assertEqual(cache.cache_info()[:3], (1, 3, 1))
+
+        with self.settings(HOST_MATCH_CACHE_SIZE=0):
+            self.assertIsNone(get_host_match_cache())
+            self.assertEqual(middleware.get_host("static")[0].name, "static")
+        self.assertIsNot(get_host_match_cache(), cache)
+        self.assertEqual(get_host_match_cache().cache_info().currsize, 0)
+
     @override_settings(
         ROOT_HOSTCONF="tests.hosts.simple",
         DEFAULT_HOST="www",
@@ -170,3 +311,68 @@ class MiddlewareTests(HostsTestCase):
         )
         with self.assertRaisesMessage(ImproperlyConfigured, msg):
             HostsRequestMiddleware(get_response_empty)
+
+
+async def get_response_async(request):
+    return HttpResponse("response")
+
+
+@override_settings(ROOT_HOSTCONF="tests.hosts.callbacks", DEFAULT_HOST="www", ALLOWED_HOSTS=["*"])
+class AsyncMiddlewareTests(HostsTestCase):
+
+    @async_to_sync
+    async def test_async_callback(self):
+        request = RequestFactory(headers={"host": "async-spam"}).get("/")
+        middleware = HostsRequestMiddleware(get_response_async)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        response = await middleware(request)
+        self.assertEqual(response.content, b"response")
+        self.assertEqual(request.urlconf, "tests.urls.multiple")
+        self.assertEqual(request.callback_urlconf, "tests.urls.multiple")
+        self.assertEqual(request.callback_name, "spam")
+
+    @async_to_sync
+    async def test_async_callback_response(self):
+        request = RequestFactory(headers={"host": "async-stop"}).get("/")
+        response = await HostsRequestMiddleware(get_response_async)(request)
+        self.assertEqual(response.content, b"stopped")
+
+    @async_to_sync
+    async def test_sync_callback(self):
+        request = RequestFactory(headers={"host": "sync-eggs"}).get("/")
+        response = await HostsRequestMiddleware(get_response_async)(request)
+        self.assertEqual(response.content, b"response")
+        self.assertEqual(request.callback_urlconf, "tests.urls.simple")
+        self.assertEqual(request.callback_name, "eggs")
+
+    def test_async_callback_in_sync_mode(self):
+        request = RequestFactory(headers={"host": "async-stop"}).get("/")
+        response = HostsRequestMiddleware(get_response_empty)(request)
+        self.assertEqual(response.content, b"stopped")
+        self.assertEqual(request.callback_urlconf, "tests.urls.multiple")
+
+    @async_to_sync
+    async def test_async_response_middleware(self):
+        request = RequestFactory(headers={"host": "async-spam"}).get("/")
+        response = await HostsResponseMiddleware(get_response_async)(request)
+        self.assertEqual(response.content, b"response")
+        self.assertEqual(request.urlconf, "tests.urls.multiple")
+        self.assertEqual(request.host_kwargs, {"name": "spam"})
+
+    @async_to_sync
+    async def test_async_subclass_process_request(self):
+        class RequestMiddleware(HostsRequestMiddleware):
+            def process_request(self, request):
+                request.processed = True
+                return super().process_request(request)
+
+        class ResponseMiddleware(HostsResponseMiddleware):
+            def process_response(self, request, response):
+                response["X-Processed"] = "1"
+                return super().process_response(request, response)
+
+        request = RequestFactory(headers={"host": "sync-eggs"}).get("/")
+        response = await RequestMiddleware(ResponseMiddleware(get_response_async))(request)
+        self.assertTrue(request.processed)
+        self.assertEqual(request.callback_name, "eggs")
+        self.assertEqual(response["X-Processed"], "1")
@@ -1,14 +1,28 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
 from django.core.exceptions import ImproperlyConfigured
 from django.test.utils import override_settings
-from django.urls import NoReverseMatch
+from django.urls import (
+    NoReverseMatch,
+    clear_script_prefix,
+    get_urlconf,
+    reverse as reverse_path,
+    set_script_prefix,
+)
+from django.utils.safestring import SafeString
 
 from django_hosts.resolvers import (
     get_host,
+    get_host_index,
     get_host_patterns,
     get_hostconf,
     get_hostconf_module,
+    get_reverse_cache,
     reverse,
     reverse_host,
+    reverse_many,
+    using_host,
 )
 
 from .base import HostsTestCase
@@ -38,6 +52,13 @@ class ReverseTest(HostsTestCase):
     def test_reverse(self):
         self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/simple/")
 
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="spam.eggs")
+    def test_reverse_url_prefix(self):
+        self.assertEqual(get_host("static").url_prefix, "//static.spam.eggs")
+        with self.settings(HOST_PORT="8000"):
+            self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs:8000/simple/")
+        self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/simple/")
+
     @override_settings(ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="example.com")
     def test_reverse_without_www(self):
         self.assertEqual(reverse("simple-direct", host="without_www"), "//example.com/simple/")
@@ -63,6 +84,145 @@ class ReverseTest(HostsTestCase):
         )
 
 
+@override_settings(ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="spam.eggs")
+class ReverseManyTests(HostsTestCase):
+
+    def test_reverse_many(self):
+        args_list = [("spam",), {"template": "eggs"}]
+        self.assertEqual(
+            list(reverse_many("complex-direct", args_list, host="with_view_kwargs", host_args_fn=lambda item: ["x"])),
+            ["//sx.spam.eggs/template/spam/", "//sx.spam.eggs/template/eggs/"],
+        )
+        self.assertEqual(
+            list(reverse_many("simple-direct", [()] * 2, host="port", scheme="https")),
+            [reverse("simple-direct", host="port", scheme="https")] * 2,
+        )
+
+    def test_reverse_many_host_args(self):
+        urls = reverse_many(
+            "simple-direct",
+            [(), {}],
+            host="with_kwargs",
+            host_args_fn=lambda item: {"username": "dict" if isinstance(item, dict) else "tuple"},
+            port="8000",
+        )
+        self.assertEqual(list(urls), ["//tuple.spam.eggs:8000/simple/", "//dict.spam.eggs:8000/simple/"])
+
+    def test_reverse_many_converters(self):
+        args_list = [(1,), {"pk": 2}, ("3",)]
+        self.assertEqual(
+            list(reverse_many("complex-item", args_list, host="with_view_kwargs", host_args_fn=lambda item: ["x"])),
+            ["//sx.spam.eggs/item/1/", "//sx.spam.eggs/item/2/", "//sx.spam.eggs/item/3/"],
+        )
+        urls = reverse_many("complex-item", [("x",)], host="with_view_kwargs", host_args_fn=lambda item: ["x"])
+        self.assertRaises(NoReverseMatch, list, urls)
+
+    def test_reverse_many_errors(self):
+        self.assertRaises(NoReverseMatch, reverse_many, "simple-direct", [], host="non-existent")
+        self.assertRaises(NoReverseMatch, reverse_many, "simple-direct", [], host="with_kwargs")
+        urls = reverse_many("complex-direct", [("-",)], host="static")
+        self.assertRaises(NoReverseMatch, list, urls)
+        urls = reverse_many("admin:index", [()], host="static")
+        self.assertRaises(NoReverseMatch, list, urls)
+        urls = reverse_many("complex-direct", ["spam"], host="static")
+        self.assertRaises(TypeError, list, urls)
+        urls = reverse_many("simple-direct", [()], host="with_args", host_args_fn=lambda item: "spam")
+        self.assertRaises(TypeError, list, urls)
+
+
+class Unhashable:
+    __hash__ = None
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return self.value
+
+
+@override_settings(ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="spam.eggs", HOST_REVERSE_CACHE_SIZE=10)
+class ReverseCacheTests(HostsTestCase):
+
+    def test_reverse_cache(self):
+        self.assertEqual(get_host("static").url_prefix, "//static.spam.eggs")
+        cache = get_reverse_cache()
+        cache.clear()
+        self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/simple/")
+        self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/simple/")
+        self.assertEqual(reverse_host("with_kwargs", kwargs={"username": "johndoe"}), "johndoe.spam.eggs")
+        self.assertEqual(reverse_host("with_kwargs", kwargs={"username": "johndoe"}), "johndoe.spam.eggs")
+        self.assertEqual(cache.cache_info()[:2], (2, 2))
+
+        self.assertEqual(reverse_host("with_args", [Unhashable("johndoe")]), "johndoe.spam.eggs")
+        self.assertEqual(cache.cache_info()[:2], (2, 2))
+
+        with self.settings(PARENT_HOST="example.com"):
+            self.assertEqual(reverse("simple-direct", host="static"), "//static.example.com/simple/")
+        self.assertIsNot(get_reverse_cache(), cache)
+
+    def test_reverse_cache_typed(self):
+        cache = get_reverse_cache()
+        cache.clear()
+        self.assertEqual(reverse_host("with_args", args=[1]), "1.spam.eggs")
+        self.assertEqual(reverse_host("with_args", args=[True]), "True.spam.eggs")
+        self.assertEqual(reverse_host("with_args", args=(1,)), "1.spam.eggs")
+        self.assertEqual(cache.cache_info()[:2], (0, 3))
+        # Floats and str subclasses aren't cached.
+        self.assertEqual(reverse_host("with_args", args=[1.0]), "1.0.spam.eggs")
+        self.assertEqual(reverse_host("with_args", args=[SafeString("1")]), "1.spam.eggs")
+        self.assertEqual(cache.cache_info()[:2], (0, 3))
+        self.assertEqual(reverse_host("with_args", args=[True]), "True.spam.eggs")
+        self.assertEqual(cache.cache_info()[:2], (1, 3))
+
+    def test_reverse_cache_script_prefix(self):
+        self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/simple/")
+        set_script_prefix("/prefix/")
+        try:
+            self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/prefix/simple/")
+        finally:
+            clear_script_prefix()
+
+    def test_reverse_cache_disabled(self):
+        with self.settings(HOST_REVERSE_CACHE_SIZE=0):
+            self.assertIsNone(get_reverse_cache())
+            self.assertEqual(reverse("simple-direct", host="static"), "//static.spam.eggs/simple/")
+
+
+@override_settings(ROOT_HOSTCONF="tests.hosts.simple")
+class UsingHostTests(HostsTestCase):
+
+    def test_using_host(self):
+        urlconf = get_urlconf()
+        with using_host("with_view_kwargs") as host:
+            self.assertEqual(host.name, "with_view_kwargs")
+            self.assertEqual(get_urlconf(), "tests.urls.complex")
+            self.assertEqual(reverse_path("complex-direct", args=["test"]), "/template/test/")
+            with using_host(get_host("static")):
+                self.assertEqual(get_urlconf(), "tests.urls.simple")
+            self.assertEqual(get_urlconf(), "tests.urls.complex")
+        self.assertEqual(get_urlconf(), urlconf)
+        with self.assertRaises(NoReverseMatch):
+            with using_host("non-existent"):
+                pass
+
+    @async_to_sync
+    async def test_using_host_concurrently(self):
+        urlconf = get_urlconf()
+
+        async def use(name, urlconf):
+            with using_host(name):
+                await asyncio.sleep(0.01)
+                self.assertEqual(get_urlconf(), urlconf)
+                await asyncio.sleep(0.01)
+                self.assertEqual(get_urlconf(), urlconf)
+
+        await asyncio.gather(
+            use("static", "tests.urls.simple"),
+            use("with_view_kwargs", "tests.urls.complex"),
+        )
+        self.assertEqual(get_urlconf(), urlconf)
+
+
 class UtilityTests(HostsTestCase):
 
     @override_settings(ROOT_HOSTCONF="tests.hosts.simple")
@@ -101,6 +261,14 @@ class UtilityTests(HostsTestCase):
     def test_appended_patterns(self):
         self.assertEqual(get_host("special").name, "special")
 
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple")
+    def test_get_host_index(self):
+        index = get_host_index()
+        self.assertEqual(list(index), [host.name for host in simple.host_patterns])
+        self.assertIs(index["static"], simple.host_patterns[2])
+        with self.settings(ROOT_HOSTCONF="tests.hosts.appended"):
+            self.assertIn("special", get_host_index())
+
 
 @override_settings(
     ROOT_HOSTCONF="tests.hosts.simple",
@@ -1,20 +1,31 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
 from django.contrib.sites.models import Site
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.db import connection
+from django.http import Http404, HttpResponse
 from django.test import RequestFactory
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils.functional import empty
 
+from django_hosts.callbacks import SITE_VERSION_KEY, LazySite, local_sites, preload_sites, site_locks
+from django_hosts.checks import check_site_domains
+from django_hosts.managers import SitePath
 from django_hosts.middleware import HostsRequestMiddleware
 
 from .base import HostsTestCase
-from .models import Author, BlogPost, WikiPage
+from .models import Author, BlogPost, Event, Talk, WikiPage
 
 
 def get_response_empty(request):
     return HttpResponse()
 
 
-@override_settings(ALLOWED_HOSTS=["wiki.site1", "wiki.site2", "admin.site4", "static"])
+@override_settings(ALLOWED_HOSTS=["wiki.site1", "wiki.site2", "admin.site4", "local.site5", "static"])
 class SitesTests(HostsTestCase):
 
     def setUp(self):
@@ -23,6 +34,8 @@ class SitesTests(HostsTestCase):
         self.site2 = Site.objects.create(domain="wiki.site2", name="site2")
         self.site3 = Site.objects.create(domain="wiki.site3", name="site3")
         self.site4 = Site.objects.create(domain="admin.site4", name="site4")
+        self.site5 = Site.objects.create(domain="local.site5", name="site5")
+        self.site6 = Site.objects.create(domain="Preloaded.Site6", name="site6")
         self.page1 = WikiPage.objects.create(content="page1", site=self.site1)
         self.page2 = WikiPage.objects.create(content="page2", site=self.site1)
         self.page3 = WikiPage.objects.create(content="page3", site=self.site2)
@@ -34,7 +47,7 @@ class SitesTests(HostsTestCase):
         self.post2 = BlogPost.objects.create(content="post2", author=self.author2)
 
     def tearDown(self):
-        for model in [WikiPage, BlogPost, Author, Site]:
+        for model in [WikiPage, BlogPost, Author, Talk, Event, Site]:
             model.objects.all().delete()
 
     @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
@@ -46,6 +59,57 @@ class SitesTests(HostsTestCase):
         self.assertEqual(request.urlconf, "tests.urls.simple")
         self.assertEqual(request.site.pk, self.site1.pk)
 
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www", ALLOWED_HOSTS=["*"])
+    def test_sites_callback_host_domain(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        request = RequestFactory(headers={"host": "wiki.Site1:8000"}).get("/simple/")
+        middleware.process_request(request)
+        self.assertEqual(request.host_domain, "wiki.site1")
+        with mock.patch("django_hosts.callbacks.reverse_host") as reverse_host:
+            self.assertEqual(request.site.pk, self.site1.pk)
+        reverse_host.assert_not_called()
+
+        # The host is reversed if its pattern matched only the start of
+        # the request's host.
+        request = RequestFactory(headers={"host": "wiki.site1.example.com"}).get("/simple/")
+        middleware.process_request(request)
+        self.assertIsNone(request.host_domain)
+        self.assertEqual(request.site.pk, self.site1.pk)
+
+        # Or always, e.g. to use the canonical domain.
+        request = RequestFactory(headers={"host": "wiki.site1:8000"}).get("/simple/")
+        middleware.process_request(request)
+        with mock.patch("django_hosts.callbacks.HOST_SITE_REVERSE_HOST", True):
+            with mock.patch("django_hosts.callbacks.reverse_host", return_value="wiki.site1") as reverse_host:
+                self.assertEqual(request.site.pk, self.site1.pk)
+        reverse_host.assert_called_once_with("with_callback", args=(), kwargs={"domain": "site1"})
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    @mock.patch("django_hosts.callbacks.HOST_SITE_LOOKUP", "exact")
+    def test_sites_callback_exact_lookup(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        request = RequestFactory(headers={"host": "wiki.site1"}).get("/simple/")
+        middleware.process_request(request)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(request.site.pk, self.site1.pk)
+        self.assertNotIn("LIKE", queries[0]["sql"])
+
+        # The reversed host is normalized too.
+        with mock.patch("django_hosts.callbacks.HOST_SITE_REVERSE_HOST", True):
+            request = RequestFactory(headers={"host": "wiki.SITE2"}).get("/simple/")
+            middleware.process_request(request)
+            self.assertEqual(request.site.pk, self.site2.pk)
+
+    def test_site_domains_check(self):
+        Site.objects.create(domain="Wiki.Site8.", name="site8")
+        self.assertEqual(check_site_domains(None, databases=["default"]), [])
+        with self.settings(HOST_SITE_LOOKUP="exact"):
+            self.assertEqual(check_site_domains(None), [])
+            warnings = check_site_domains(None, databases=["default"])
+        self.assertEqual([warning.id for warning in warnings], ["django_hosts.W001"] * 2)
+        self.assertEqual([warning.obj.domain for warning in warnings], ["Preloaded.Site6", "Wiki.Site8."])
+        self.assertIn("Change it to 'wiki.site8'", warnings[1].hint)
+
     @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
     def test_sites_cached_callback(self):
         rf = RequestFactory(headers={"host": "admin.site4"})
@@ -66,6 +130,187 @@ class SitesTests(HostsTestCase):
         self.assertNumQueries(0, get_site)
         self.assertEqual(request.site.pk, self.site4.pk)
 
+    def get_cached_site_request(self):
+        request = RequestFactory(headers={"host": "admin.site4"}).get("/simple/")
+        HostsRequestMiddleware(get_response_empty).process_request(request)
+        return request
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_sites_cached_callback_payload(self):
+        cache.delete("hosts:admin.site4")
+        self.get_cached_site_request().site.pk
+        self.assertEqual(cache.get("hosts:admin.site4"), ("site:1", self.site4.pk, "admin.site4", "site4"))
+
+        request = self.get_cached_site_request()
+        self.assertNumQueries(0, lambda: request.site.pk)
+        site = request.site._wrapped
+        self.assertEqual((site.pk, site.domain, site.name), (self.site4.pk, "admin.site4", "site4"))
+        self.assertFalse(site._state.adding)
+        self.assertEqual(site._state.db, "default")
+        site.name = "changed"
+        site.save()
+        self.assertEqual(Site.objects.get(pk=self.site4.pk).name, "changed")
+
+        # Sites cached as model instances are still used, other values aren't.
+        cache.set("hosts:admin.site4", self.site1)
+        self.assertEqual(self.get_cached_site_request().site.pk, self.site1.pk)
+        cache.set("hosts:admin.site4", ("site:0", self.site1.pk))
+        self.assertEqual(self.get_cached_site_request().site.pk, self.site4.pk)
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_sites_cached_callback_single_flight(self):
+        cache.delete("hosts:admin.site4")
+        calls = []
+
+        def slow_get_site(lazy_site, host):
+            calls.append(host)
+            time.sleep(0.1)
+            return self.site4
+
+        sites = []
+        with mock.patch.object(LazySite, "get_site", slow_get_site):
+            threads = [
+                threading.Thread(target=lambda: sites.append(self.get_cached_site_request().site.pk)) for i in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(calls, ["admin.site4"])
+        self.assertEqual(sites, [self.site4.pk] * 3)
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    @mock.patch("django_hosts.callbacks.HOST_SITE_STALE_TIMEOUT", 60)
+    def test_sites_cached_callback_stale(self):
+        cache.delete("hosts:admin.site4")
+        self.assertNumQueries(1, lambda: self.get_cached_site_request().site.pk)
+        payload, refresh_at = cache.get("hosts:admin.site4")
+        self.assertEqual(payload, ("site:1", self.site4.pk, "admin.site4", "site4"))
+        self.assertAlmostEqual(refresh_at, time.time() + 3600, delta=10)
+        self.assertNumQueries(0, lambda: self.get_cached_site_request().site.pk)
+
+        # Another thread refreshes the stale site, so it's used meanwhile.
+        cache.set("hosts:admin.site4", (self.site1, time.time() - 1))
+        with site_locks("hosts:admin.site4"):
+            self.assertEqual(self.get_cached_site_request().site.pk, self.site1.pk)
+
+        # The stale site is refreshed.
+        self.assertNumQueries(1, lambda: self.get_cached_site_request().site.pk)
+        self.assertEqual(cache.get("hosts:admin.site4")[0][1], self.site4.pk)
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    @mock.patch("django_hosts.callbacks.HOST_SITE_LOCK_TIMEOUT", 0.2)
+    def test_sites_cached_callback_cache_lock(self):
+        cache.delete("hosts:admin.site4")
+        self.assertNumQueries(1, lambda: self.get_cached_site_request().site.pk)
+        self.assertIsNone(cache.get("hosts:admin.site4:lock"))
+
+        # Another process gets the site, which is used once cached.
+        cache.delete("hosts:admin.site4")
+        cache.add("hosts:admin.site4:lock", True)
+        timer = threading.Timer(0.1, cache.set, ["hosts:admin.site4", self.site1])
+        timer.start()
+        self.assertNumQueries(0, lambda: self.get_cached_site_request().site.pk)
+        timer.join()
+        self.assertEqual(cache.get("hosts:admin.site4"), self.site1)
+
+        # The site is got from the database when the other process fails.
+        cache.delete("hosts:admin.site4")
+        self.assertNumQueries(1, lambda: self.get_cached_site_request().site.pk)
+        cache.delete("hosts:admin.site4:lock")
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    @mock.patch("django_hosts.callbacks.HOST_SITE_TIMEOUT_JITTER", 0.5)
+    def test_sites_cached_callback_jitter(self):
+        cache.delete("hosts:admin.site4")
+        with mock.patch("django.core.cache.cache.set") as cache_set:
+            self.get_cached_site_request().site.pk
+        timeout = cache_set.call_args[0][2]
+        self.assertGreaterEqual(timeout, 1800)
+        self.assertLessEqual(timeout, 3600)
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_sites_local_cached_callback(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+
+        def get_site():
+            request = RequestFactory(headers={"host": "local.site5"}).get("/simple/")
+            middleware.process_request(request)
+            return request.site.domain
+
+        self.assertNumQueries(1, get_site)
+        self.assertEqual(local_sites.get("local.site5")[0], self.site5)
+
+        # The site is kept in memory, without even using the cache.
+        with mock.patch("django.core.cache.cache.get") as cache_get:
+            self.assertNumQueries(0, get_site)
+        cache_get.assert_not_called()
+
+        # The site is still in the cache when it expires in memory.
+        with mock.patch("django_hosts.callbacks.HOST_SITE_LOCAL_TIMEOUT", -1):
+            local_sites.clear()
+            self.assertNumQueries(0, get_site)
+            self.assertNumQueries(0, get_site)
+
+        # Changing a site invalidates the sites in memory and in the cache.
+        version = cache.get(SITE_VERSION_KEY)
+        self.site5.domain = "local.changed"
+        self.site5.save()
+        self.assertEqual(cache.get(SITE_VERSION_KEY), version + 1)
+        self.assertEqual(local_sites.cache_info().currsize, 0)
+        self.assertRaises(Http404, get_site)
+
+        self.site5.domain = "local.site5"
+        self.site5.save()
+        self.assertNumQueries(1, get_site)
+
+        # Other processes notice the change when the site expires in memory.
+        local_sites.set("local.site5", (self.site4, version, time.monotonic() - 1))
+        self.assertNumQueries(0, get_site)
+        self.assertEqual(get_site(), "local.site5")
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_sites_local_cached_callback_missing_version(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        request = RequestFactory(headers={"host": "local.site5"}).get("/simple/")
+        middleware.process_request(request)
+        cache.delete(SITE_VERSION_KEY)
+        self.assertEqual(request.site.pk, self.site5.pk)
+        self.assertIsNotNone(cache.get(SITE_VERSION_KEY))
+        cache.delete(SITE_VERSION_KEY)
+        self.site5.save()
+        self.assertIsNotNone(cache.get(SITE_VERSION_KEY))
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www", ALLOWED_HOSTS=["*"])
+    def test_sites_preloaded_callback(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+
+        def get_site(host="preloaded.site6"):
+            request = RequestFactory(headers={"host": host}).get("/simple/")
+            middleware.process_request(request)
+            return request.site.pk
+
+        with mock.patch("django_hosts.callbacks.preloaded_sites", None):
+            # The sites are loaded on the first request if needed.
+            self.assertNumQueries(1, get_site)
+            self.assertNumQueries(0, get_site)
+
+        self.assertNumQueries(1, preload_sites)
+        self.assertNumQueries(0, get_site)
+        self.assertEqual(get_site(), self.site6.pk)
+        self.assertRaises(Http404, get_site, "preloaded.spam")
+
+        # Saving and deleting sites updates the loaded sites.
+        self.site6.domain = "preloaded.changed"
+        self.site6.save()
+        self.assertRaises(Http404, get_site)
+        self.assertNumQueries(0, get_site, "preloaded.changed")
+        self.assertEqual(get_site("preloaded.changed"), self.site6.pk)
+        site = Site.objects.create(domain="preloaded.site7", name="site7")
+        self.assertEqual(get_site("preloaded.site7"), site.pk)
+        site.delete()
+        self.assertRaises(Http404, get_site, "preloaded.site7")
+
     @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
     def test_sites_callback_with_parent_host(self):
         rf = RequestFactory(headers={"host": "wiki.site2"})
@@ -85,6 +330,34 @@ class SitesTests(HostsTestCase):
         self.assertEqual(request.site.pk, self.site2.pk)
         self.assertEqual(list(WikiPage.on_site.by_request(request)), [self.page3])
 
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
+    def test_manager_lazy(self):
+        middleware = HostsRequestMiddleware(get_response_empty)
+        request = RequestFactory(headers={"host": "wiki.site2"}).get("/simple/")
+        middleware.process_request(request)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(list(WikiPage.on_site.by_request(request, lazy=True)), [self.page3])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('FROM "django_site"', queries[0]["sql"])
+        self.assertEqual(request.site._wrapped, empty)
+
+        # The site's id is used once the site is retrieved.
+        self.assertEqual(request.site.pk, self.site2.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(list(WikiPage.on_site.by_request(request, lazy=True)), [self.page3])
+        self.assertNotIn("U0", queries[0]["sql"])
+
+        request = RequestFactory(headers={"host": "admin.site4"}).get("/simple/")
+        middleware.process_request(request)
+        self.assertEqual(list(BlogPost.on_site.by_request(request, lazy=True)), [])
+
+    @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www", ALLOWED_HOSTS=["*"])
+    def test_manager_lazy_missing_site(self):
+        request = RequestFactory(headers={"host": "wiki.spam"}).get("/simple/")
+        HostsRequestMiddleware(get_response_empty).process_request(request)
+        self.assertEqual(list(WikiPage.on_site.by_request(request, lazy=True)), [])
+        self.assertRaises(Http404, WikiPage.on_site.by_request, request)
+
     @override_settings(ROOT_HOSTCONF="tests.hosts.simple", DEFAULT_HOST="www")
     def test_manager_missing_site(self):
         rf = RequestFactory(headers={"host": "static"})
@@ -105,6 +378,35 @@ class SitesTests(HostsTestCase):
         with self.settings(SITE_ID=self.site2.id):
             self.assertEqual(list(BlogPost.on_site.all()), [self.post2])
 
+    def test_manager_select_related(self):
+        with self.settings(SITE_ID=self.site1.id):
+            with self.assertNumQueries(1):
+                self.assertEqual([post.author.site.name for post in BlogPost.on_site.all()], ["site1"])
+            with self.assertNumQueries(3):
+                self.assertEqual([post.author.site.name for post in BlogPost.no_select_related.all()], ["site1"])
+
+    def test_manager_many_to_many(self):
+        event1 = Event.objects.create(name="event1")
+        event1.sites.set([self.site1, self.site2])
+        event2 = Event.objects.create(name="event2")
+        event2.sites.set([self.site2])
+        talk1 = Talk.objects.create(title="talk1", event=event1)
+        talk2 = Talk.objects.create(title="talk2", event=event2)
+        with self.settings(SITE_ID=self.site2.id):
+            with self.assertNumQueries(2):
+                events = list(Event.on_site.order_by("pk"))
+                self.assertEqual([len(event.sites.all()) for event in events], [2, 1])
+            self.assertEqual(events, [event1, event2])
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(list(Event.exists_on_site.order_by("pk")), [event1, event2])
+            self.assertIn("EXISTS", queries[0]["sql"])
+            with self.assertNumQueries(2):
+                talks = list(Talk.on_site.order_by("pk"))
+                self.assertEqual([len(talk.event.sites.all()) for talk in talks], [2, 1])
+            self.assertEqual(talks, [talk1, talk2])
+        with self.settings(SITE_ID=self.site1.id):
+            self.assertEqual(list(Talk.on_site.all()), [talk1])
+
     def test_no_select_related(self):
         with self.settings(SITE_ID=self.site1.id):
             self.assertEqual(list(BlogPost.no_select_related.all()), [self.post1])
@@ -117,6 +419,104 @@ class SitesTests(HostsTestCase):
         with self.settings(SITE_ID=self.site1.id):
             self.assertRaises(ValueError, BlogPost.dead_end.all)
 
+    def test_manager_site_path(self):
+        self.assertEqual(
+            BlogPost.on_site._get_site_path(),
+            SitePath(filter_key="author__site_id", select_related="author__site", prefetch_related=None),
+        )
+        # The relations are only validated once per model and field name.
+        self.assertIs(BlogPost.on_site._get_site_path(), BlogPost.no_select_related._get_site_path())
+        self.assertEqual(WikiPage.on_site._get_site_path().filter_key, "site_id")
+        self.assertEqual(Event.on_site._get_site_path().filter_key, "sites__id")
+        self.assertNotIn("django_site", str(BlogPost.no_select_related.by_id(1).query))
+
+    def test_manager_check(self):
+        self.assertEqual(BlogPost.on_site.check(), [])
+        self.assertEqual(Talk.on_site.check(), [])
+        for manager in [BlogPost.non_existing, BlogPost.dead_end, BlogPost.non_rel]:
+            with self.subTest(manager=manager.name):
+                errors = manager.check()
+                self.assertEqual([error.id for error in errors], ["django_hosts.E003"])
+                self.assertEqual(errors[0].obj, BlogPost)
+        self.assertIn(
+            "HostSiteManager couldn't find a field named blabla in BlogPost.", BlogPost.non_existing.check()[0].msg
+        )
+
     def test_non_rel_field(self):
         with self.settings(SITE_ID=self.site1.id):
             self.assertRaises(TypeError, BlogPost.non_rel.all)
+
+
+async def get_response_async(request):
+    return HttpResponse()
+
+
+@override_settings(ROOT_HOSTCONF="tests.hosts.callbacks", DEFAULT_HOST="www", ALLOWED_HOSTS=["*"])
+class AsyncSitesTests(HostsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.site1 = Site.objects.create(domain="asite.site1", name="site1")
+        self.site2 = Site.objects.create(domain="acached.site2", name="site2")
+        cache.delete("hosts:acached.site2")
+
+    @async_to_sync
+    async def test_async_site_callback(self):
+        request = RequestFactory(headers={"host": "asite.site1"}).get("/")
+        await HostsRequestMiddleware(get_response_async)(request)
+        site = await request.asite()
+        self.assertEqual(site, self.site1)
+        self.assertEqual(request.site.pk, self.site1.pk)
+        self.assertIs(await request.asite(), site)
+
+        request = RequestFactory(headers={"host": "asite.spam"}).get("/")
+        await HostsRequestMiddleware(get_response_async)(request)
+        with self.assertRaises(Http404):
+            await request.asite()
+
+    @async_to_sync
+    async def test_async_cached_site_callback(self):
+        for i in range(2):
+            request = RequestFactory(headers={"host": "acached.site2"}).get("/")
+            await HostsRequestMiddleware(get_response_async)(request)
+            self.assertEqual(await request.asite(), self.site2)
+            self.assertEqual(request.site.pk, self.site2.pk)
+            self.assertEqual(
+                await cache.aget("hosts:acached.site2"), ("site:1", self.site2.pk, "acached.site2", "site2")
+            )
+
+    @async_to_sync
+    @mock.patch("django_hosts.callbacks.HOST_SITE_STALE_TIMEOUT", 60)
+    @mock.patch("django_hosts.callbacks.HOST_SITE_LOCK_TIMEOUT", 10)
+    async def test_async_cached_site_callback_stale(self):
+        await cache.aset("hosts:acached.site2", (self.site1, time.time() - 1))
+        await cache.aadd("hosts:acached.site2:lock", True)
+        request = RequestFactory(headers={"host": "acached.site2"}).get("/")
+        await HostsRequestMiddleware(get_response_async)(request)
+        # Another process refreshes the stale site.
+        self.assertEqual(await request.asite(), self.site1)
+
+        await cache.adelete("hosts:acached.site2:lock")
+        request = RequestFactory(headers={"host": "acached.site2"}).get("/")
+        await HostsRequestMiddleware(get_response_async)(request)
+        self.assertEqual(await request.asite(), self.site2)
+        self.assertEqual((await cache.aget("hosts:acached.site2"))[0][1], self.site2.pk)
+        self.assertIsNone(await cache.aget("hosts:acached.site2:lock"))
+
+    @async_to_sync
+    @mock.patch("django_hosts.callbacks.HOST_SITE_LOCK_TIMEOUT", 0.2)
+    async def test_async_cached_site_callback_cache_lock(self):
+        # Another process gets the site, which is used once cached.
+        await cache.aadd("hosts:acached.site2:lock", True)
+        asyncio.get_running_loop().call_later(0.1, cache.set, "hosts:acached.site2", self.site1)
+        request = RequestFactory(headers={"host": "acached.site2"}).get("/")
+        await HostsRequestMiddleware(get_response_async)(request)
+        self.assertEqual(await request.asite(), self.site1)
+
+        # The site is got from the database when the other process fails.
+        await cache.adelete("hosts:acached.site2")
+        request = RequestFactory(headers={"host": "acached.site2"}).get("/")
+        await HostsRequestMiddleware(get_response_async)(request)
+        self.assertEqual(await request.asite(), self.site2)
+        self.assertEqual((await cache.aget("hosts:acached.site2"))[1], self.site2.pk)
+        await cache.adelete("hosts:acached.site2:lock")
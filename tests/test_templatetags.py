@@ -1,7 +1,12 @@
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
 from django.template import Context, Template, TemplateSyntaxError
 from django.template.base import Parser
 from django.test.utils import override_settings
-from django_hosts.templatetags.hosts import parse_params
+from django.urls import NoReverseMatch, clear_script_prefix, set_script_prefix
+from django_hosts.resolvers import reverse_host
+from django_hosts.templatetags.hosts import HostURLNode, parse_params
 
 from .base import HostsTestCase
 
@@ -45,6 +50,46 @@ class TemplateTagsTest(HostsTestCase):
                 "//www.example.com/simple/",
             )
 
+    @override_settings(
+        DEFAULT_HOST="static",
+        ROOT_HOSTCONF="tests.hosts.simple",
+        PARENT_HOST="eggs.spam",
+        ROOT_URLCONF="tests.urls.complex",
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "OPTIONS": {"builtins": ["django_hosts.templatetags.hosts_override"]},
+            }
+        ],
+    )
+    def test_url_tag_override_modes(self):
+        for mode, expected in [
+            ("host", "//static.eggs.spam/simple/"),
+            ("default_host", "//static.eggs.spam/simple/"),
+        ]:
+            with self.subTest(mode=mode), self.settings(HOST_OVERRIDE_URL_MODE=mode):
+                self.assertRender("{% url 'simple-direct' %}", expected)
+                self.assertRender("{% url 'simple-direct' as url %}{{ url }}", expected)
+                self.assertRender("{% url 'simple-direct' host 'port' %}", "//port.eggs.spam:12345/simple/")
+                self.assertRender("{% url 'simple-direct' port 8000 %}", "//static.eggs.spam:8000/simple/")
+
+        with self.settings(HOST_OVERRIDE_URL_MODE="path"):
+            self.assertRender("{% url 'complex-direct' 'spam' %}", "/template/spam/")
+            self.assertRender("{% url 'simple-direct' host 'port' %}", "//port.eggs.spam:12345/simple/")
+
+        with self.settings(HOST_OVERRIDE_URL_MODE="default_host", DEFAULT_HOST="with_args"):
+            self.assertRaises(NoReverseMatch, self.render, "{% url 'simple-direct' %}")
+
+        # A default host with optional parameters only is reversed.
+        with self.settings(
+            HOST_OVERRIDE_URL_MODE="default_host", DEFAULT_HOST="optional", ROOT_HOSTCONF="tests.hosts.appended"
+        ):
+            self.assertRender("{% host_url 'simple-direct' %}", "//eggs.spam/simple/")
+            self.assertRender("{% url 'simple-direct' %}", "//eggs.spam/simple/")
+
+        with self.settings(HOST_OVERRIDE_URL_MODE="spam"):
+            self.assertRaises(ImproperlyConfigured, self.render, "{% url 'simple-direct' %}")
+
     @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple")
     def test_host_url_tag_without_host(self):
         self.assertRender("{% host_url 'simple-direct' %}", "//www.example.com/simple/")
@@ -109,6 +154,76 @@ class TemplateTagsTest(HostsTestCase):
     def test_host_url_no_www(self):
         self.assertRender("{% host_url 'simple-direct' host 'without_www' %}", "//example.com/simple/")
 
+    @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="eggs.spam")
+    def test_host_url_literal_arguments(self):
+        template = Template("{% load hosts %}{% host_url 'simple-direct' host 'static' scheme 'https' port 8000 %}")
+        (node,) = template.nodelist.get_nodes_by_type(HostURLNode)
+        self.assertEqual(node.host, "static")
+        self.assertEqual(node.scheme, "https://")
+        self.assertEqual(node.port, ":8000")
+        self.assertEqual(node.urls, {})
+        self.assertEqual(template.render(Context()), "https://static.eggs.spam:8000/simple/")
+        self.assertEqual(list(node.urls.values()), ["https://static.eggs.spam:8000/simple/"])
+        self.assertEqual(template.render(Context()), "https://static.eggs.spam:8000/simple/")
+        self.assertEqual(len(node.urls), 1)
+
+        set_script_prefix("/prefix/")
+        try:
+            self.assertEqual(template.render(Context()), "https://static.eggs.spam:8000/prefix/simple/")
+        finally:
+            clear_script_prefix()
+        with self.settings(PARENT_HOST="example.com"):
+            self.assertEqual(node.urls, {})
+            self.assertEqual(template.render(Context()), "https://static.example.com:8000/simple/")
+        # the host is looked up again when the hostconf changes
+        with self.settings(ROOT_HOSTCONF="tests.hosts.multiple"):
+            self.assertRaises(NoReverseMatch, template.render, Context())
+
+    @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="eggs.spam")
+    def test_host_url_variable_arguments(self):
+        template = Template("{% load hosts %}{% host_url 'simple-direct' host name port port %}")
+        (node,) = template.nodelist.get_nodes_by_type(HostURLNode)
+        self.assertIsNone(node.urls)
+        self.assertEqual(
+            template.render(Context({"name": "static", "port": "8000"})),
+            "//static.eggs.spam:8000/simple/",
+        )
+        self.assertEqual(
+            template.render(Context({"name": "port", "port": ""})),
+            "//port.eggs.spam/simple/",
+        )
+        self.assertRender("{% host_url 'simple-direct' host 'port' port '' %}", "//port.eggs.spam/simple/")
+
+    @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple", PARENT_HOST="eggs.spam")
+    def test_host_url_in_loop(self):
+        template = Template(
+            "{% load hosts %}{% for item in items %}"
+            "{% host_url 'complex-direct' item host 'with_view_kwargs' subdomain=user %} "
+            "{% endfor %}"
+        )
+        with mock.patch("django_hosts.templatetags.hosts.reverse_host", wraps=reverse_host) as mocked:
+            rendered = template.render(Context({"items": ["a", "b", "c"], "user": "john"}))
+        self.assertEqual(
+            rendered.split(),
+            ["//sjohn.eggs.spam/template/a/", "//sjohn.eggs.spam/template/b/", "//sjohn.eggs.spam/template/c/"],
+        )
+        self.assertEqual(mocked.call_count, 1)
+
+    @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple")
+    def test_host_url_in_loop_typed(self):
+        template = Template(
+            "{% load hosts %}{% for value in values %}"
+            "{% host_url 'simple-direct' host 'with_args' value %} "
+            "{% endfor %}"
+        )
+        rendered = template.render(Context({"values": [1, True, 1]}))
+        self.assertEqual(rendered.split(), ["//1/simple/", "//True/simple/", "//1/simple/"])
+
+    @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple")
+    def test_host_url_unknown_literal_host(self):
+        template = Template("{% load hosts %}{% host_url 'simple-direct' host 'non-existent' %}")
+        self.assertRaises(NoReverseMatch, template.render, Context())
+
     @override_settings(DEFAULT_HOST="www", ROOT_HOSTCONF="tests.hosts.simple")
     def test_raises_template_syntaxerror(self):
         self.assertRaises(TemplateSyntaxError, self.render, "{% host_url %}")
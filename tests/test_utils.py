@@ -1,4 +1,4 @@
-from django_hosts.utils import normalize_scheme, normalize_port
+from django_hosts.utils import KeyLock, LRUCache, normalize_domain, normalize_scheme, normalize_port, regex_literal
 
 from .base import HostsTestCase
 
@@ -16,3 +16,44 @@ class UtilsTest(HostsTestCase):
         self.assertEqual(normalize_port("80"), ":80")
         self.assertEqual(normalize_port("80:"), ":80")
         self.assertEqual(normalize_port(), "")
+
+    def test_normalize_domain(self):
+        self.assertEqual(normalize_domain("www.example.com"), "www.example.com")
+        self.assertEqual(normalize_domain("WWW.Example.com."), "www.example.com")
+        self.assertEqual(normalize_domain("Bücher.example"), "xn--bcher-kva.example")
+        self.assertEqual(normalize_domain("xn--bcher-kva.example"), "xn--bcher-kva.example")
+        self.assertEqual(normalize_domain("localhost:8000"), "localhost:8000")
+
+    def test_regex_literal(self):
+        self.assertEqual(regex_literal("www"), "www")
+        self.assertEqual(regex_literal(r"www\.example\.com"), "www.example.com")
+        self.assertEqual(regex_literal(r"^port\-tag"), "port-tag")
+        self.assertEqual(regex_literal(""), "")
+        self.assertIsNone(regex_literal(r"(\w+)"))
+        self.assertIsNone(regex_literal(r"|www"))
+        self.assertIsNone(regex_literal(r"www.example"))
+        self.assertIsNone(regex_literal("www\\"))
+
+    def test_lru_cache(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(tuple(cache.cache_info()), (2, 2, 1, 2, 2))
+        cache.clear()
+        self.assertEqual(tuple(cache.cache_info()), (0, 0, 0, 2, 0))
+
+    def test_key_lock(self):
+        key_lock = KeyLock()
+        with key_lock("a") as acquired:
+            self.assertTrue(acquired)
+            with key_lock("a", blocking=False) as acquired:
+                self.assertFalse(acquired)
+            with key_lock("b", blocking=False) as acquired:
+                self.assertTrue(acquired)
+            self.assertEqual(list(key_lock._locks), ["a"])
+        self.assertEqual(key_lock._locks, {})
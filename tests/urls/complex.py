@@ -1,6 +1,7 @@
-from django.urls import re_path
+from django.urls import path, re_path
 from tests.views import test_view
 
 urlpatterns = [
     re_path(r"^template/(?P<template>\w+)/$", test_view, name="complex-direct"),
+    path("item/<int:pk>/", test_view, name="complex-item"),
 ]